@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""过程模型与观测模型共用的计算后端工具。
+
+集中处理可选依赖 numba 的导入、``backend`` 参数的校验与解析, 以及标量/逐像元
+参数的统一表示, 避免各模型各自维护一份。
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+try:
+    import numba
+    from numba import prange
+except Exception:
+    numba = None
+    prange = range
+
+BACKENDS = ("numpy", "numba", "auto")
+
+
+def resolve_backend(backend: str) -> str:
+    """校验 ``backend`` 并解析 "auto"。
+
+    "numpy" 为参考实现, "numba" 为单遍融合内核, "auto" 在安装了 numba 时选 numba。
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的计算后端: {backend}")
+    if backend == "numba" and numba is None:
+        raise ImportError("numba 后端需要安装 numba: pip install numba")
+    if backend == "auto":
+        return "numba" if numba is not None else "numpy"
+    return backend
+
+
+def as_parameter(value: float | Sequence[float] | np.ndarray) -> float | np.ndarray:
+    """标量参数保持为 float, 逐像元参数转为一维 float 数组。"""
+
+    if np.ndim(value) == 0:
+        return float(value)
+    return np.ascontiguousarray(value, dtype=float).reshape(-1)
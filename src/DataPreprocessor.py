@@ -33,6 +33,11 @@ except ImportError as exc:
 
 from shapely.geometry import Point, shape
 
+try:
+    from shapely import contains_xy, prepare as prepare_geometry
+except ImportError:  # shapely < 2.0
+    contains_xy = None
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -166,15 +171,19 @@ class DataPreprocessor:
         logger.info(f"找到 {len(nc_files)} 个 CYGNSS 文件")
         
         dfs = []
+        n_extracted = 0
         for nc_file in nc_files:
             try:
                 df = self._read_single_cygnss_file(nc_file)
                 if not df.empty:
+                    n_extracted += 1
+                    # 逐文件做 AOI 过滤, 只合并 AOI 内的点
+                    df = self._filter_by_aoi(df)
                     dfs.append(df)
             except Exception as e:
                 logger.warning(f"读取文件失败，跳过: {nc_file.name} - {e}")
         
-        if not dfs:
+        if not n_extracted:
             raise RuntimeError("未能从任何 CYGNSS 文件中提取数据")
         
         # 合并所有数据
@@ -186,9 +195,6 @@ class DataPreprocessor:
             (all_data['time'] <= self.end_date)
         ]
         
-        # 空间过滤（AOI 内）
-        all_data = self._filter_by_aoi(all_data)
-        
         self.cygnss_data = all_data
         
         logger.info(f"✅ CYGNSS 数据读取完成")
@@ -282,11 +288,19 @@ class DataPreprocessor:
         if df.empty:
             return df
         
-        # 精过滤：多边形内部
-        mask = df.apply(
-            lambda row: self.roi_polygon.contains(Point(row['lon'], row['lat'])),
-            axis=1
-        )
+        # 精过滤：多边形内部 (shapely>=2 时对预处理多边形做向量化判定)
+        if contains_xy is not None:
+            prepare_geometry(self.roi_polygon)
+            mask = contains_xy(
+                self.roi_polygon,
+                df['lon'].to_numpy(dtype=float),
+                df['lat'].to_numpy(dtype=float),
+            )
+        else:
+            mask = df.apply(
+                lambda row: self.roi_polygon.contains(Point(row['lon'], row['lat'])),
+                axis=1
+            )
         
         return df[mask].copy()
     
@@ -44,15 +44,24 @@ class EnsembleKalmanFilter:
         anomalies = matrix - mean
         return EnsembleStatistics(mean=mean, anomalies=anomalies)
 
+    def _member_bound(self, name: str) -> np.ndarray | float:
+        """读取过程模型的上界; 逐像元数组通过 ``pixel_index`` 展开到集合成员。"""
+
+        bound = getattr(self.process_model, name)
+        if np.ndim(bound) == 0:
+            return bound
+        pixel_index = getattr(self.process_model, "pixel_index", None)
+        return np.asarray(bound)[pixel_index] if pixel_index is not None else np.asarray(bound)
+
     def _apply_physical_bounds(self) -> None:
-        """根据过程模型提供的极值限制集合成员。"""
+        """根据过程模型提供的极值 (标量或逐像元数组) 限制集合成员。"""
 
         if self.ensemble is None or self.state_dim is None:
             return
         if self.state_dim >= 1 and hasattr(self.process_model, "sm_sat"):
-            self.ensemble[:, 0] = np.clip(self.ensemble[:, 0], 0.0, self.process_model.sm_sat)
+            self.ensemble[:, 0] = np.clip(self.ensemble[:, 0], 0.0, self._member_bound("sm_sat"))
         if self.state_dim >= 2 and hasattr(self.process_model, "vwc_max"):
-            self.ensemble[:, 1] = np.clip(self.ensemble[:, 1], 0.0, self.process_model.vwc_max)
+            self.ensemble[:, 1] = np.clip(self.ensemble[:, 1], 0.0, self._member_bound("vwc_max"))
 
     # ------------------------------------------------------------- 公共接口
     def initialize(self, initial_mean: Sequence[float], initial_cov: np.ndarray) -> None:
@@ -90,10 +99,15 @@ class EnsembleKalmanFilter:
     def analysis(
         self,
         observation: Sequence[float] | float,
-        observation_cov: np.ndarray,
-        obs_params: Mapping[str, float] | None = None,
+        observation_cov: np.ndarray | float,
+        obs_params: Mapping[str, float | np.ndarray] | None = None,
     ) -> None:
-        """结合观测更新集合成员。"""
+        """结合观测更新集合成员。
+
+        ``observation_cov`` 可为完整协方差矩阵, 也可为对角方差数组
+        (如 ``ObservationErrorModel.variances`` 的输出)。``obs_params`` 中的几何参数
+        可为逐观测数组, 此时观测算子一次给出 ``(N, m)`` 的预测观测。
+        """
 
         ensemble = self._ensure_initialized()
         predicted_obs = self.observation_model.run(ensemble, obs_params)
@@ -104,16 +118,30 @@ class EnsembleKalmanFilter:
 
         cov_xz = state_stats.anomalies.T @ obs_stats.anomalies / (self.N - 1)
 
-        r = np.asarray(observation_cov, dtype=float)
-        if r.ndim == 1:
-            r = np.diag(r)
-        cov_zz = obs_stats.anomalies.T @ obs_stats.anomalies / (self.N - 1) + r
-
-        kalman_gain = cov_xz @ np.linalg.inv(cov_zz)
-
         obs_vector = np.asarray(observation, dtype=float)
         obs_vector = np.atleast_1d(obs_vector)
-        perturbations = np.random.multivariate_normal(np.zeros(r.shape[0]), r, size=self.N)
+
+        r = np.asarray(observation_cov, dtype=float)
+        if r.ndim <= 1:
+            # 对角 R 以方差数组形式参与计算, 不构造稠密矩阵; 方差为 inf 的观测直接剔除
+            r_diag = np.broadcast_to(r, obs_vector.shape)
+            valid = np.isfinite(r_diag) & np.isfinite(obs_vector)
+            if not np.any(valid):
+                return
+            if not np.all(valid):
+                obs_vector = obs_vector[valid]
+                predicted_obs = predicted_obs[:, valid]
+                r_diag = r_diag[valid]
+                obs_stats = self._stats(predicted_obs)
+                cov_xz = state_stats.anomalies.T @ obs_stats.anomalies / (self.N - 1)
+            cov_zz = obs_stats.anomalies.T @ obs_stats.anomalies / (self.N - 1)
+            cov_zz[np.diag_indices_from(cov_zz)] += r_diag
+            perturbations = np.random.standard_normal((self.N, r_diag.shape[0])) * np.sqrt(r_diag)
+        else:
+            cov_zz = obs_stats.anomalies.T @ obs_stats.anomalies / (self.N - 1) + r
+            perturbations = np.random.multivariate_normal(np.zeros(r.shape[0]), r, size=self.N)
+
+        kalman_gain = np.linalg.solve(cov_zz, cov_xz.T).T
         perturbed_obs = obs_vector + perturbations
 
         innovation = perturbed_obs - predicted_obs
@@ -21,6 +21,7 @@
     pip install geemap earthengine-api geopandas shapely
     pip install xarray netCDF4 h5netcdf
     pip install scipy pandas numpy
+    pip install pyarrow            # 可选：逐文件抽取结果缓存（cache_dir）
 """
 
 from __future__ import annotations
@@ -28,13 +29,16 @@ import os
 import re
 import json
 import glob
+import hashlib
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 
 warnings.filterwarnings("ignore")
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 # GEE / geospatial
 import ee
@@ -42,12 +46,28 @@ import geemap
 import geopandas as gpd
 from shapely.geometry import shape, Point
 
+try:
+    from shapely import contains_xy, prepare as prepare_geometry
+except Exception:  # shapely < 2.0
+    contains_xy = None
+
 # local CYGNSS
 try:
     import xarray as xr
 except Exception:
     xr = None
 
+try:
+    import netCDF4
+except Exception:
+    netCDF4 = None
+
+# 抽取结果缓存（Parquet）
+try:
+    import pyarrow
+except Exception:
+    pyarrow = None
+
 # LHS
 try:
     from scipy.stats.qmc import LatinHypercube
@@ -55,6 +75,24 @@ except Exception:
     LatinHypercube = None
 
 
+# ---------------------- 并行读取（进程池工作函数） ----------------------
+_WORKER_READER = None
+
+
+def _init_ingest_worker(reader: "GNSSREnKFModule1"):
+    """进程池初始化：每个工作进程只接收一次读取器副本。"""
+    global _WORKER_READER
+    _WORKER_READER = reader
+
+
+def _ingest_worker(path: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """工作进程读取单个文件，返回 (路径, {"daily": 逐日统计列, "points": 点表列或 None}, 错误信息)。"""
+    try:
+        return path, _WORKER_READER._process_one_cygnss_file_to_columns(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
 class GNSSREnKFModule1:
     """
     模块一主类：AOI加载、GEE可用性探测、本地CYGNSS(L1 v3.2)读取与覆盖统计、
@@ -67,6 +105,26 @@ class GNSSREnKFModule1:
         "modis_ndvi": ["MODIS/061/MOD13Q1", "MODIS/006/MOD13Q1", "MODIS/061/MYD13Q1"]
     }
 
+    # power-brcs specular 点抽取用到的变量；其余变量（DDM 图像、元数据等）在打开文件时丢弃
+    _SPECULAR_VARIABLES = (
+        "ddm_timestamp_utc", "sp_lat", "sp_lon", "sp_inc_angle",
+        "reflectivity_peak", "ddm_nbrcs", "ddm_nbrcs_center", "ddm_nbrcs_peak", "ddm_nbrcs_scale_factor",
+        "ddm_ant", "quality_flags_2", "track_id", "spacecraft_num",
+        "brcs", "brcs_ddm_sp_bin_delay_row", "brcs_ddm_sp_bin_dopp_col",
+    )
+
+    # CYGNSS 文件名：cyg0N.ddmi.sYYYYMMDD-HHMMSS-eYYYYMMDD-HHMMSS...
+    _CYGNSS_FILENAME_RE = re.compile(
+        r"cyg(?P<spacecraft>\d{2})\.ddmi\.s(?P<start>\d{8}-\d{6})-e(?P<end>\d{8}-\d{6})", re.I
+    )
+
+    # 抽取逻辑版本号；抽取结果的列或口径变化时递增，使旧缓存失效
+    _EXTRACTOR_VERSION = 2
+
+    # BRCS 兜底读取时单个超平面的最大样本数（约 2048×4×17×11×4B ≈ 6 MB）
+    _BRCS_BLOCK_SAMPLES = 2048
+    _BRCS_ALIGN_SAMPLES = 128
+
     def __init__(
         self,
         aoi_geojson_path: str,
@@ -79,6 +137,11 @@ class GNSSREnKFModule1:
         random_seed: int = 42,
         cygnss_required_substrings: Tuple[str, ...] = ("L1", "3.2"),  # 只匹配包含这些关键字的文件
         cygnss_glob_pattern: str = "**/*.nc",   # 可改为 "**/*.nc4" 或 "**/*.h5" 等
+        n_workers: Optional[int] = 1,           # CYGNSS 读取进程数；1 为串行，None 为全部 CPU
+        cache_dir: Optional[str] = None,        # 逐文件抽取结果缓存目录（Parquet）；None 不缓存
+        keep_cygnss_points: bool = False,       # 是否保留 sample 级点表（默认只做流式逐日统计）
+        sample_chunk_size: Optional[int] = 8192,  # 单文件按 sample 分块读取的块大小；None 为整文件一次读取
+        compact_angles: bool = False,           # 点表中的入射角以 float16 保存（约 0.03° 精度）
     ):
         self.aoi_geojson_path = aoi_geojson_path
         self.local_cygnss_dir = local_cygnss_dir
@@ -90,6 +153,14 @@ class GNSSREnKFModule1:
         self.random_seed = int(random_seed)
         self.cygnss_required_substrings = tuple(cygnss_required_substrings)
         self.cygnss_glob_pattern = cygnss_glob_pattern
+        self.n_workers = (os.cpu_count() or 1) if n_workers is None else max(1, int(n_workers))
+        self.cache_dir = cache_dir
+        self.keep_cygnss_points = bool(keep_cygnss_points)
+        self.sample_chunk_size = None if sample_chunk_size is None else max(1, int(sample_chunk_size))
+        self.compact_angles = bool(compact_angles)
+        if self.cache_dir is not None and pyarrow is None:
+            print("[WARN] 未安装 pyarrow，抽取结果缓存已停用：pip install pyarrow")
+            self.cache_dir = None
 
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -99,6 +170,7 @@ class GNSSREnKFModule1:
         self.dates = pd.date_range(self.start_date, self.end_date, freq="D", tz="UTC")
 
         self.availability: Dict[str, Dict[str, Any]] = {}
+        self.cygnss_file_index: Optional[pd.DataFrame] = None
         self.cygnss_points_df: Optional[pd.DataFrame] = None
         self.cygnss_daily_obs_df: Optional[pd.DataFrame] = None
         self.coverage_series: Optional[pd.Series] = None
@@ -127,6 +199,12 @@ class GNSSREnKFModule1:
             "cygnss_daily_obs": self.cygnss_daily_obs_df
         }
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """进程池序列化时去掉 GEE 句柄（工作进程只做本地文件读取）。"""
+        state = self.__dict__.copy()
+        state["roi_ee"] = None
+        return state
+
     def set_local_fallback(self, *, imerg: Optional[bool] = None, era5: Optional[bool] = None, ndvi: Optional[bool] = None):
         """设置本地回退标志位，并更新 ready_for_assim。"""
         if self.daily_plan is None:
@@ -184,7 +262,7 @@ class GNSSREnKFModule1:
 
     # ---------------------- 内部：本地 CYGNSS L1 v3.2 ----------------------
     def _discover_cygnss_files(self) -> List[str]:
-        """在本地目录递归查找 CYGNSS L1 v3.2 文件（按关键字过滤）。"""
+        """在本地目录递归查找 CYGNSS L1 v3.2 文件（按关键字过滤），并按文件名时间段剪枝。"""
         pattern = os.path.join(self.local_cygnss_dir, self.cygnss_glob_pattern)
         files = glob.glob(pattern, recursive=True)
         # 仅保留包含必须子串的文件（如 "L1", "3.2"）
@@ -196,7 +274,69 @@ class GNSSREnKFModule1:
             # 若严格筛选后为空，回退到全部匹配
             filtered = files
         filtered = sorted(filtered)
-        return filtered
+
+        # 文件名索引：不打开文件即可剔除与 [start_date, end_date] 不相交的文件
+        index = self._build_cygnss_file_index(filtered)
+        window_start = self.dates.min()
+        window_end = self.dates.max() + pd.Timedelta(days=1)
+        unknown = index["start"].isna() | index["end"].isna()
+        keep = unknown | ((index["end"] >= window_start) & (index["start"] <= window_end))
+        if len(index) and not keep.any():
+            raise FileNotFoundError(
+                f"在目录 {self.local_cygnss_dir} 下找到 {len(index)} 个CYGNSS文件，"
+                f"但按文件名时间段均不与 [{self.start_date}, {self.end_date}] 相交。"
+            )
+        self.cygnss_file_index = index[keep].reset_index(drop=True)
+        return self.cygnss_file_index["path"].tolist()
+
+    def _build_cygnss_file_index(self, files: List[str]) -> pd.DataFrame:
+        """解析文件名得到 [path, spacecraft, start, end]；无法解析的文件时间为 NaT（保留，不剪枝）。"""
+        rows = []
+        for path in files:
+            match = self._CYGNSS_FILENAME_RE.search(os.path.basename(path))
+            if match is None:
+                rows.append({"path": path, "spacecraft": np.nan, "start": None, "end": None})
+                continue
+            rows.append({
+                "path": path,
+                "spacecraft": int(match.group("spacecraft")),
+                "start": match.group("start"),
+                "end": match.group("end"),
+            })
+        index = pd.DataFrame(rows, columns=["path", "spacecraft", "start", "end"])
+        for col in ("start", "end"):
+            index[col] = pd.to_datetime(index[col], format="%Y%m%d-%H%M%S", errors="coerce", utc=True)
+        return index
+
+    @staticmethod
+    def _attrs_footprint(attrs: Dict[str, Any]) -> Optional[List[float]]:
+        """全局属性 geospatial_* 给出的文件覆盖范围 [lon_min, lat_min, lon_max, lat_max]；缺失返回 None。"""
+        keys = ("geospatial_lon_min", "geospatial_lat_min", "geospatial_lon_max", "geospatial_lat_max")
+        if not all(k in attrs for k in keys):
+            return None
+        return [float(attrs[k]) for k in keys]
+
+    @staticmethod
+    def _merge_footprint(footprint: Optional[List[float]], lat: np.ndarray, lon: np.ndarray) -> List[float]:
+        """把一批位置的外包框并入 footprint；无有效位置的文件范围为 []。"""
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        footprint = list(footprint or [])
+        if not valid.any():
+            return footprint
+        bounds = [float(lon[valid].min()), float(lat[valid].min()), float(lon[valid].max()), float(lat[valid].max())]
+        if not footprint:
+            return bounds
+        return [min(footprint[0], bounds[0]), min(footprint[1], bounds[1]),
+                max(footprint[2], bounds[2]), max(footprint[3], bounds[3])]
+
+    def _footprint_intersects_aoi(self, footprint: Optional[List[float]]) -> bool:
+        """文件覆盖范围是否可能与 AOI 外包框相交；范围未知（None）时按相交处理。"""
+        if footprint is None:
+            return True
+        if len(footprint) != 4:
+            return False
+        minx, miny, maxx, maxy = self.roi_polygon.bounds
+        return footprint[0] <= maxx and footprint[2] >= minx and footprint[1] <= maxy and footprint[3] >= miny
 
     @staticmethod
     def _pick_var(ds: "xr.Dataset", candidates: List[str]) -> Optional[str]:
@@ -226,8 +366,13 @@ class GNSSREnKFModule1:
             return np.power(10.0, arr / 10.0)
         return arr
 
-    def _combine_reflectivity_arrays(self, ds: "xr.Dataset", shape: Tuple[int, int]) -> np.ndarray:
-        """优先使用 reflectivity_peak, 其次 nbrcs 系列，保持线性单位。"""
+    def _combine_reflectivity_arrays(
+        self, ds: "xr.Dataset", shape: Tuple[int, int], mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """优先使用 reflectivity_peak, 其次 nbrcs 系列，保持线性单位。
+
+        mask 为 (sample, ddm) 的保留掩码，仅用于 BRCS 兜底时按需读取 specular bin。
+        """
         arr = np.full(shape, np.nan, dtype=np.float32)
         candidates = (
             "reflectivity_peak",
@@ -247,31 +392,78 @@ class GNSSREnKFModule1:
 
         if np.isnan(arr).all():
             try:
-                arr = self._extract_specular_from_brcs(ds)
+                arr = self._extract_specular_from_brcs(ds, mask)
             except Exception:
                 pass
         return arr
 
-    def _extract_specular_from_brcs(self, ds: "xr.Dataset") -> np.ndarray:
-        """兜底：根据 specular bin 索引从 4D BRCS 提取标量。"""
+    def _extract_specular_from_brcs(self, ds: "xr.Dataset", mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """兜底：根据 specular bin 索引从 4D BRCS 提取标量。
+
+        不整体读取 (sample, ddm, delay, doppler) 立方体：先由 mask 找出仍需保留的样本，
+        按 brcs 的 sample 分块对齐合并成连续区间，逐区间读取超平面再取 specular bin；
+        mask 之外的位置为 NaN。
+        """
         needed = {"brcs", "brcs_ddm_sp_bin_delay_row", "brcs_ddm_sp_bin_dopp_col"}
         if not needed.issubset(set(ds.data_vars)):
             n_sample = int(ds.dims.get("sample", 0) or 0)
             n_ddm = int(ds.dims.get("ddm", 0) or 0)
             return np.full((n_sample, n_ddm), np.nan, dtype=np.float32)
-        brcs = np.asarray(ds["brcs"].values, dtype=np.float32)
+        brcs = ds["brcs"]
+        n_sample, n_ddm, n_delay, n_dopp = brcs.shape
+        values = np.full((n_sample, n_ddm), np.nan, dtype=np.float32)
+        if mask is None:
+            mask = np.ones((n_sample, n_ddm), dtype=bool)
+        samples = np.flatnonzero(mask.any(axis=1))
+        if samples.size == 0:
+            return values
+
         delay_idx = np.rint(np.asarray(ds["brcs_ddm_sp_bin_delay_row"].values)).astype(int)
         doppler_idx = np.rint(np.asarray(ds["brcs_ddm_sp_bin_dopp_col"].values)).astype(int)
-        n_sample, n_ddm, n_delay, n_dopp = brcs.shape
         delay_idx = np.clip(delay_idx, 0, n_delay - 1)
         doppler_idx = np.clip(doppler_idx, 0, n_dopp - 1)
-        sample_idx = np.arange(n_sample)[:, None]
-        ddm_idx = np.arange(n_ddm)[None, :]
-        values = brcs[sample_idx, ddm_idx, delay_idx, doppler_idx]
-        return values.astype(np.float32)
+
+        # 区间边界对齐到磁盘分块（连续存储时按 _BRCS_ALIGN_SAMPLES 对齐，避免大量零碎读取），
+        # 单次读取不超过 _BRCS_BLOCK_SAMPLES
+        chunksizes = brcs.encoding.get("chunksizes") or (self._BRCS_ALIGN_SAMPLES,)
+        chunk = max(int(chunksizes[0] or 1), 1)
+        max_blocks = max(self._BRCS_BLOCK_SAMPLES // chunk, 1)
+        blocks = np.unique(samples // chunk)
+        breaks = np.flatnonzero((np.diff(blocks) > 1) | (np.arange(1, blocks.size) % max_blocks == 0)) + 1
+        for run in np.split(blocks, breaks):
+            s0 = int(run[0]) * chunk
+            s1 = min((int(run[-1]) + 1) * chunk, n_sample)
+            rows, cols = np.nonzero(mask[s0:s1])
+            if rows.size == 0:
+                continue
+            cube = np.asarray(brcs[s0:s1].values, dtype=np.float32)
+            values[rows + s0, cols] = cube[rows, cols, delay_idx[rows + s0, cols], doppler_idx[rows + s0, cols]]
+        return values
+
+    @staticmethod
+    def _src_file_column(path: str, n: int) -> pd.Categorical:
+        """src_file 列：单类别的 Categorical，每行只占 1 字节编码。"""
+        return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[os.path.basename(path)])
+
+    @staticmethod
+    def _concat_points(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+        """拼接多个文件的点表；src_file 合并类别后仍为 Categorical，不退化为逐行字符串。"""
+        if len(dfs) == 1:
+            return dfs[0].reset_index(drop=True)
+        if not all("src_file" in d.columns and isinstance(d["src_file"].dtype, pd.CategoricalDtype) for d in dfs):
+            return pd.concat(dfs, ignore_index=True)
+        columns = list(dict.fromkeys(c for d in dfs for c in d.columns))
+        df = pd.concat([d.drop(columns="src_file") for d in dfs], ignore_index=True)
+        df["src_file"] = union_categoricals([d["src_file"] for d in dfs])
+        return df[columns]
 
     def _extract_power_brcs_specular_points(self, ds: "xr.Dataset", path: str) -> Optional[pd.DataFrame]:
-        """针对 CYGNSS L1 v3.2 power-brcs 文件提取 specular 点。"""
+        """针对 CYGNSS L1 v3.2 power-brcs 文件提取 specular 点。
+
+        沿 sample 维按 sample_chunk_size 分块读取：每块先读位置与天线并求掩码，
+        无保留点的块不再读取其余变量；峰值内存由块大小而非文件大小决定。
+        顺带由已读入的位置得到文件覆盖范围，记在结果的 attrs["footprint"] 中。
+        """
         required = {"ddm_timestamp_utc", "sp_lat", "sp_lon"}
         if not required.issubset(set(ds.variables) | set(ds.coords)):
             return None
@@ -281,36 +473,41 @@ class GNSSREnKFModule1:
         if not n_sample or not n_ddm:
             return None
 
-        time_idx = pd.to_datetime(ds["ddm_timestamp_utc"].values, utc=True, errors="coerce")
-        lat = np.asarray(ds["sp_lat"].values, dtype=np.float32)
-        lon = np.asarray(ds["sp_lon"].values, dtype=np.float32)
-        inc = (
-            np.asarray(ds["sp_inc_angle"].values, dtype=np.float32)
-            if "sp_inc_angle" in ds
-            else np.full_like(lat, np.nan, dtype=np.float32)
+        spacecraft = (
+            int(ds["spacecraft_num"].values)
+            if "spacecraft_num" in ds
+            else None
         )
+        step = int(self.sample_chunk_size or n_sample)
+        frames = []
+        footprint: List[float] = []
+        for s0 in range(0, int(n_sample), step):
+            part = ds.isel(sample=slice(s0, min(s0 + step, int(n_sample))))
+            df, footprint = self._extract_specular_chunk(part, path, spacecraft, footprint)
+            if df is not None and not df.empty:
+                frames.append(df)
+
+        df = self._concat_points(frames) if frames else self._empty_points_df()
+        df.attrs["footprint"] = footprint
+        return df
 
-        reflect = self._combine_reflectivity_arrays(ds, lat.shape)
+    @staticmethod
+    def _empty_points_df() -> pd.DataFrame:
+        """AOI 外包框内无点时的空点表。"""
+        return pd.DataFrame(columns=["time", "lat", "lon", "incidence_angle", "reflectivity"])
+
+    def _extract_specular_chunk(
+        self, ds: "xr.Dataset", path: str, spacecraft: Optional[int], footprint: List[float]
+    ) -> Tuple[Optional[pd.DataFrame], List[float]]:
+        """从一个 sample 分块中取出 AOI 外包框内、天线 2/3 的 specular 点，并更新文件覆盖范围。"""
+        lat = np.asarray(ds["sp_lat"].values, dtype=np.float32)
+        lon = np.asarray(ds["sp_lon"].values, dtype=np.float32)
+        footprint = self._merge_footprint(footprint, lat, lon)
         ddm_ant = (
             np.asarray(ds["ddm_ant"].values, dtype=np.float32)
             if "ddm_ant" in ds
             else np.full(lat.shape, np.nan, dtype=np.float32)
         )
-        quality = (
-            np.asarray(ds["quality_flags_2"].values, dtype=np.float32)
-            if "quality_flags_2" in ds
-            else None
-        )
-        track_id = (
-            np.asarray(ds["track_id"].values, dtype=np.float32)
-            if "track_id" in ds
-            else None
-        )
-        spacecraft = (
-            int(ds["spacecraft_num"].values)
-            if "spacecraft_num" in ds
-            else None
-        )
 
         minx, miny, maxx, maxy = self.roi_polygon.bounds
         bbox_mask = (
@@ -323,41 +520,43 @@ class GNSSREnKFModule1:
         )
         ant_mask = np.isfinite(ddm_ant) & np.isin(ddm_ant, (2, 3))
         mask = bbox_mask & ant_mask
-
         if not np.any(mask):
-            return pd.DataFrame(columns=["time", "lat", "lon", "incidence_angle", "reflectivity"])
+            return None, footprint
 
-        flat_mask = mask.reshape(-1)
-        time_flat = np.repeat(time_idx.to_numpy(), n_ddm)[flat_mask]
-        lat_flat = lat.reshape(-1)[flat_mask]
-        lon_flat = lon.reshape(-1)[flat_mask]
-        inc_flat = inc.reshape(-1)[flat_mask]
-        refl_flat = reflect.reshape(-1)[flat_mask]
-        ant_flat = ddm_ant.reshape(-1)[flat_mask].astype(np.int16)
-        ddm_index = np.tile(np.arange(n_ddm, dtype=np.int16), int(n_sample))[flat_mask]
+        # 只保留存活位置的 (sample, ddm) 下标，避免整块 repeat/tile
+        rows, cols = np.nonzero(mask)
+        reflect = self._combine_reflectivity_arrays(ds, lat.shape, mask)
+        time_idx = pd.to_datetime(ds["ddm_timestamp_utc"].values, utc=True, errors="coerce")
+        inc = (
+            np.asarray(ds["sp_inc_angle"].values, dtype=np.float32)[rows, cols]
+            if "sp_inc_angle" in ds
+            else np.full(rows.size, np.nan, dtype=np.float32)
+        )
 
         df = pd.DataFrame(
             {
-                "time": pd.to_datetime(time_flat, utc=True, errors="coerce"),
-                "lat": lat_flat,
-                "lon": lon_flat,
-                "incidence_angle": inc_flat,
-                "reflectivity": refl_flat,
-                "ddm_index": ddm_index,
-                "ddm_ant": ant_flat,
-                "src_file": os.path.basename(path),
+                "time": time_idx[rows],
+                "lat": lat[rows, cols],
+                "lon": lon[rows, cols],
+                "incidence_angle": inc,
+                "reflectivity": reflect[rows, cols],
+                "ddm_index": cols.astype(np.int16),
+                "ddm_ant": ddm_ant[rows, cols].astype(np.int16),
+                "src_file": self._src_file_column(path, rows.size),
             }
         )
 
-        if quality is not None:
-            df["quality_flags_2"] = quality.reshape(-1)[flat_mask]
-        if track_id is not None:
-            df["track_id"] = track_id.reshape(-1)[flat_mask]
+        # 整型字段：缺失的质量标志视为无标志（0），缺失的 track_id 记为 -1
+        if "quality_flags_2" in ds:
+            flags = np.asarray(ds["quality_flags_2"].values)[rows, cols]
+            df["quality_flags_2"] = np.nan_to_num(flags, nan=0).astype(np.int32)
+        if "track_id" in ds:
+            track = np.asarray(ds["track_id"].values)[rows, cols]
+            df["track_id"] = np.nan_to_num(track, nan=-1).astype(np.int32)
         if spacecraft is not None:
-            df["spacecraft"] = spacecraft
+            df["spacecraft"] = np.full(rows.size, spacecraft, dtype=np.int8)
 
-        df = df.dropna(subset=["time", "lat", "lon", "reflectivity"])
-        return df
+        return df.dropna(subset=["time", "lat", "lon", "reflectivity"]), footprint
 
     def _extract_obs_inc_from_ds(self, ds: "xr.Dataset") -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -448,15 +647,35 @@ class GNSSREnKFModule1:
         inc = np.asarray(inc).reshape(-1)
         return refl_lin, inc
 
+    @staticmethod
+    def _open_cygnss_dataset(path: str, variables: Optional[Tuple[str, ...]] = None) -> "xr.Dataset":
+        """打开 L1 文件；给定 variables 时先用 netCDF4 读变量名，打开阶段即丢弃其余变量。"""
+        drop = None
+        if variables is not None and netCDF4 is not None:
+            with netCDF4.Dataset(path, "r") as handle:
+                drop = [name for name in handle.variables if name not in variables]
+        return xr.open_dataset(path, drop_variables=drop)
+
     def _read_one_cygnss_file_to_df(self, path: str) -> pd.DataFrame:
-        """读取单个 L1 文件 -> DataFrame: [time, lat, lon, incidence_angle, reflectivity]."""
+        """读取单个 L1 文件 -> DataFrame: [time, lat, lon, incidence_angle, reflectivity].
+
+        文件覆盖范围记在 attrs["footprint"]（[lon_min, lat_min, lon_max, lat_max]，无有效位置为 []）。
+        """
         if xr is None:
             raise RuntimeError("需要 xarray，请安装：pip install xarray netCDF4 h5netcdf")
-        with xr.open_dataset(path) as ds:
+        # 优先按 power-brcs 布局只打开所需变量；布局不符时再完整打开走通用兜底
+        with self._open_cygnss_dataset(path, self._SPECULAR_VARIABLES) as ds:
+            footprint = self._attrs_footprint(ds.attrs)
+            if not self._footprint_intersects_aoi(footprint):
+                # 全局属性表明文件不可能经过 AOI：只读了头信息，不读取任何变量
+                df = self._empty_points_df()
+                df.attrs["footprint"] = footprint
+                return df
             specialized = self._extract_power_brcs_specular_points(ds, path)
             if specialized is not None:
                 return specialized
 
+        with xr.open_dataset(path) as ds:
             # time/lat/lon 候选（通用兜底）
             tname = self._pick_var(ds, ["time", "sp_time", "ddm_time_utc", "ddm_timestamp_utc", "ddm_time"])
             latn = self._pick_var(ds, ["ddm_sp_lat", "sp_lat", "lat", "latitude", "ddm_sp_latitude"])
@@ -480,12 +699,194 @@ class GNSSREnKFModule1:
                     "lon": lon_vals[:n],
                     "incidence_angle": inc_deg[:n],
                     "reflectivity": refl_lin[:n],
-                    "src_file": os.path.basename(path),
+                    "src_file": self._src_file_column(path, n),
                 }
             )
             df = df.dropna(subset=["time", "lat", "lon"])
+            df.attrs["footprint"] = self._merge_footprint(None, np.asarray(lat_vals, dtype=float), np.asarray(lon_vals, dtype=float))
             return df
 
+    def _cache_paths(self, path: str) -> Tuple[str, str]:
+        """缓存分片与其元数据文件的路径（按源文件绝对路径哈希命名）。"""
+        key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key}.parquet"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_one_cygnss_file_cached(self, path: str) -> pd.DataFrame:
+        """带缓存的单文件抽取（AOI 多边形精筛之前的结果）。
+
+        分片以 (路径, 大小, mtime, 抽取版本) 为键；记录抽取时的 AOI 外包框与文件覆盖范围，
+        新 AOI 的外包框落在前者之内、或与后者不相交（AOI 内必然无点）时直接读取分片，
+        否则重新解析并覆盖。
+        """
+        if self.cache_dir is None:
+            return self._read_one_cygnss_file_to_df(path)
+
+        stat = os.stat(path)
+        signature = {
+            "path": os.path.abspath(path),
+            "size": int(stat.st_size),
+            "mtime_ns": int(stat.st_mtime_ns),
+            "version": self._EXTRACTOR_VERSION,
+        }
+        bounds = [float(v) for v in self.roi_polygon.bounds]
+        fragment_path, meta_path = self._cache_paths(path)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            cached_bounds = meta["bbox"]
+            if all(meta.get(k) == v for k, v in signature.items()) and (
+                (cached_bounds[0] <= bounds[0] and cached_bounds[1] <= bounds[1]
+                 and cached_bounds[2] >= bounds[2] and cached_bounds[3] >= bounds[3])
+                or not self._footprint_intersects_aoi(meta.get("footprint"))
+            ):
+                df = pd.read_parquet(fragment_path)
+                df.attrs["footprint"] = meta.get("footprint")
+                return df
+        except (OSError, ValueError, KeyError):
+            pass
+
+        df = self._read_one_cygnss_file_to_df(path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 先写分片再写元数据，均经临时文件替换，中断时不会留下不一致的缓存
+        tmp_fragment = f"{fragment_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_fragment, index=False)
+        os.replace(tmp_fragment, fragment_path)
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({**signature, "bbox": bounds, "footprint": df.attrs.get("footprint")}, f)
+        os.replace(tmp_meta, meta_path)
+        return df
+
+    def _filter_cygnss_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """单文件点表的时间窗过滤 + AOI 精筛。"""
+        if df.empty:
+            return df
+        df = df[(df["time"] >= self.dates.min()) & (df["time"] <= self.dates.max() + pd.Timedelta(days=1))]
+        return self._spatial_filter_df_by_aoi(df)
+
+    @staticmethod
+    def _daily_stats(df: pd.DataFrame) -> pd.DataFrame:
+        """单文件点表 -> 逐日统计（点数、反射率与入射角的有效计数/均值/离差平方和）。"""
+        columns = ["n_points", "n_refl", "refl_mean", "refl_m2", "n_inc", "inc_mean", "inc_m2"]
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], tz="UTC", name="time"), dtype=float)
+        day = df["time"].dt.floor("D")
+        refl = df["reflectivity"].astype(np.float64)
+        inc = df["incidence_angle"].astype(np.float64)
+        g_refl = refl.groupby(day)
+        g_inc = inc.groupby(day)
+        stats = pd.DataFrame({
+            "n_points": g_refl.size(),
+            "n_refl": g_refl.count(),
+            "refl_mean": g_refl.mean(),
+            "refl_m2": g_refl.var(ddof=0) * g_refl.count(),
+            "n_inc": g_inc.count(),
+            "inc_mean": g_inc.mean(),
+            "inc_m2": g_inc.var(ddof=0) * g_inc.count(),
+        }).astype(float)
+        stats.index.name = "time"
+        return stats
+
+    @staticmethod
+    def _merge_daily_stats(a: Optional[pd.DataFrame], b: pd.DataFrame) -> pd.DataFrame:
+        """按日合并两组统计（Chan/Welford 并行公式，均值与离差平方和数值稳定）。"""
+        if a is None:
+            return b
+        index = a.index.union(b.index)
+        a = a.reindex(index)
+        b = b.reindex(index)
+        merged = pd.DataFrame(index=index)
+        merged["n_points"] = a["n_points"].fillna(0.0) + b["n_points"].fillna(0.0)
+        for count, mean, m2 in (("n_refl", "refl_mean", "refl_m2"), ("n_inc", "inc_mean", "inc_m2")):
+            na = a[count].fillna(0.0).to_numpy()
+            nb = b[count].fillna(0.0).to_numpy()
+            ma = a[mean].fillna(0.0).to_numpy()
+            mb = b[mean].fillna(0.0).to_numpy()
+            n = na + nb
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = mb - ma
+                merged[count] = n
+                merged[mean] = np.where(n > 0, ma + delta * nb / n, np.nan)
+                merged[m2] = (
+                    a[m2].fillna(0.0).to_numpy() + b[m2].fillna(0.0).to_numpy()
+                    + np.where(n > 0, delta**2 * na * nb / n, 0.0)
+                )
+        return merged
+
+    def _process_one_cygnss_file(
+        self, path: str
+    ) -> Tuple[Optional[pd.DataFrame], pd.DataFrame, Optional[List[float]]]:
+        """单文件完整处理：抽取（带缓存）-> 时间窗/AOI 过滤 -> 逐日统计，附带文件覆盖范围。
+
+        keep_cygnss_points 为 False 时不返回点表。
+        """
+        raw = self._read_one_cygnss_file_cached(path)
+        footprint = raw.attrs.get("footprint")
+        df = self._filter_cygnss_df(raw)
+        daily = self._daily_stats(df)
+        if not self.keep_cygnss_points:
+            return None, daily, footprint
+        if self.compact_angles and "incidence_angle" in df.columns:
+            # 逐日统计已按全精度计算，float16 只影响保留的点表
+            df["incidence_angle"] = df["incidence_angle"].astype(np.float16)
+        return df, daily, footprint
+
+    @staticmethod
+    def _df_to_columns(df: pd.DataFrame) -> Dict[str, Any]:
+        """DataFrame -> numpy 列字典（time 以 UTC 的 datetime64[ns] 传输，常量列只传一个值）。"""
+        columns: Dict[str, Any] = {name: df[name].to_numpy() for name in df.columns}
+        if "time" in df.columns:
+            columns["time"] = pd.to_datetime(df["time"], utc=True).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+        if "src_file" in df.columns and len(df):
+            columns["src_file"] = df["src_file"].iloc[0]
+        columns["__index__"] = df.index.tz_localize(None).to_numpy() if isinstance(df.index, pd.DatetimeIndex) else None
+        return columns
+
+    @staticmethod
+    def _columns_to_df(columns: Dict[str, Any]) -> pd.DataFrame:
+        """numpy 列字典 -> DataFrame（与 _df_to_columns 互逆，标量列自动广播）。"""
+        columns = dict(columns)
+        index = columns.pop("__index__", None)
+        n = len(index) if index is not None else len(columns["time"])
+        if "src_file" in columns and np.ndim(columns["src_file"]) == 0:
+            columns["src_file"] = GNSSREnKFModule1._src_file_column(columns["src_file"], n)
+        df = pd.DataFrame(columns, index=pd.RangeIndex(n))
+        if "time" in df.columns:
+            df["time"] = pd.to_datetime(columns["time"], utc=True)
+        if index is not None:
+            df.index = pd.DatetimeIndex(pd.to_datetime(index, utc=True), name="time")
+        return df
+
+    def _process_one_cygnss_file_to_columns(self, path: str) -> Dict[str, Any]:
+        """工作进程入口：单文件处理结果打包为 numpy 列字典（比 pickle DataFrame 紧凑）。"""
+        points, daily, footprint = self._process_one_cygnss_file(path)
+        return {
+            "points": None if points is None else self._df_to_columns(points),
+            "daily": self._df_to_columns(daily),
+            "footprint": footprint,
+        }
+
+    def _iter_cygnss_file_results(self, files: List[str]):
+        """按文件顺序产出 (路径, 点表或 None, 逐日统计或 None, 文件覆盖范围, 错误信息)；n_workers>1 时使用进程池。"""
+        if self.n_workers <= 1 or len(files) <= 1:
+            for fp in files:
+                try:
+                    points, daily, footprint = self._process_one_cygnss_file(fp)
+                    yield fp, points, daily, footprint, None
+                except Exception as e:
+                    yield fp, None, None, None, str(e)
+            return
+
+        n_workers = min(self.n_workers, len(files))
+        chunksize = max(1, len(files) // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_ingest_worker, initargs=(self,)) as pool:
+            for fp, bundle, error in pool.map(_ingest_worker, files, chunksize=chunksize):
+                if bundle is None:
+                    yield fp, None, None, None, error
+                    continue
+                points = None if bundle["points"] is None else self._columns_to_df(bundle["points"])
+                yield fp, points, self._columns_to_df(bundle["daily"]), bundle["footprint"], None
+
     def _spatial_filter_df_by_aoi(self, df: pd.DataFrame) -> pd.DataFrame:
         """点在 AOI 多边形内。预期 df 已经通过 bbox 粗裁剪。"""
         if df.empty:
@@ -494,7 +895,12 @@ class GNSSREnKFModule1:
         df = df[(df["lon"] >= minx) & (df["lon"] <= maxx) & (df["lat"] >= miny) & (df["lat"] <= maxy)]
         if df.empty:
             return df
-        mask = df.apply(lambda r: self.roi_polygon.contains(Point(float(r["lon"]), float(r["lat"]))), axis=1)
+        if contains_xy is not None:
+            # 预处理多边形后对经纬度数组整体判定（每秒可处理数百万点）
+            prepare_geometry(self.roi_polygon)
+            mask = contains_xy(self.roi_polygon, df["lon"].to_numpy(dtype=float), df["lat"].to_numpy(dtype=float))
+        else:
+            mask = df.apply(lambda r: self.roi_polygon.contains(Point(float(r["lon"]), float(r["lat"]))), axis=1)
         return df[mask].copy()
 
     def _read_local_cygnss_l1_v32(self):
@@ -506,40 +912,67 @@ class GNSSREnKFModule1:
         if not files:
             raise FileNotFoundError(f"在目录 {self.local_cygnss_dir} 下未找到CYGNSS文件（pattern={self.cygnss_glob_pattern}）。")
 
+        # 逐文件过滤并累加逐日统计，内存随天数而非点数增长；点表仅在 keep_cygnss_points 时保留
         dfs = []
-        for fp in files:
-            try:
-                df_one = self._read_one_cygnss_file_to_df(fp)
-                dfs.append(df_one)
-            except Exception as e:
+        daily_stats: Optional[pd.DataFrame] = None
+        footprints: Dict[str, Optional[List[float]]] = {}
+        n_parsed = 0
+        for fp, df_one, stats_one, footprint, error in self._iter_cygnss_file_results(files):
+            if error is not None:
                 # 某些文件可能字段差异，跳过并打印提示
-                print(f"[WARN] 解析失败（跳过）：{os.path.basename(fp)} -> {e}")
+                print(f"[WARN] 解析失败（跳过）：{os.path.basename(fp)} -> {error}")
+                continue
+            n_parsed += 1
+            footprints[fp] = footprint
+            daily_stats = self._merge_daily_stats(daily_stats, stats_one)
+            if df_one is not None and not df_one.empty:
+                # 空表的 time 列为 object，参与 concat 会使整列退化为 object
+                dfs.append(df_one)
 
-        if not dfs:
+        if not n_parsed:
             raise RuntimeError("未能从任何 L1 文件成功抽取观测。请检查变量名候选或文件内容。")
 
-        df_all = pd.concat(dfs, ignore_index=True)
-        # 时间范围过滤
-        df_all = df_all[(df_all["time"] >= self.dates.min()) & (df_all["time"] <= self.dates.max() + pd.Timedelta(days=1))]
-
-        # AOI 精筛
-        df_all = self._spatial_filter_df_by_aoi(df_all)
+        # 文件覆盖范围写入文件索引（由各文件的读取过程顺带得到，缓存于分片元数据）
+        index = self.cygnss_file_index
+        if index is not None and len(index):
+            bounds = [footprints.get(fp) for fp in index["path"]]
+            for i, col in enumerate(("lon_min", "lat_min", "lon_max", "lat_max")):
+                index[col] = [b[i] if b and len(b) == 4 else np.nan for b in bounds]
+            index["intersects_aoi"] = [
+                None if fp not in footprints else self._footprint_intersects_aoi(footprints[fp])
+                for fp in index["path"]
+            ]
+        if not any(self._footprint_intersects_aoi(f) for f in footprints.values()):
+            print(f"[WARN] {n_parsed} 个已解析文件的覆盖范围均在 AOI 之外，逐日观测为空。")
 
         # 保存 sample 级点（供可视化或调试）
-        self.cygnss_points_df = df_all.copy()
+        if self.keep_cygnss_points:
+            self.cygnss_points_df = self._concat_points(dfs) if dfs else pd.DataFrame({
+                # 文件均解析成功但 AOI 内无点
+                "time": pd.Series([], dtype="datetime64[ns, UTC]"),
+                "lat": pd.Series([], dtype=np.float32),
+                "lon": pd.Series([], dtype=np.float32),
+                "incidence_angle": pd.Series([], dtype=np.float32),
+                "reflectivity": pd.Series([], dtype=np.float32),
+            })
+        else:
+            self.cygnss_points_df = None
+
+        daily_stats = daily_stats[daily_stats["n_points"] > 0].sort_index()
+        n_points = daily_stats["n_points"].astype(np.int64)
 
         # 每日覆盖（达到阈值 min_hits_per_day）
-        day_counts = df_all.groupby(df_all["time"].dt.floor("D")).size()
-        self.coverage_series = (day_counts >= self.min_hits_per_day)
-
-        # 每日 ROI 平均观测（线性 reflectivity 与 incidence_angle）
-        daily = df_all.groupby(df_all["time"].dt.floor("D")).agg(
-            reflectivity=("reflectivity", "mean"),
-            incidence_angle=("incidence_angle", "mean"),
-            n_points=("reflectivity", "size")
-        )
-        # 索引已经继承了 UTC 时区信息，无需再次 tz_localize
-        self.cygnss_daily_obs_df = daily.sort_index()
+        self.coverage_series = (n_points >= self.min_hits_per_day).rename(None)
+
+        # 每日 ROI 平均观测（线性 reflectivity 与 incidence_angle）及反射率日内标准差
+        with np.errstate(invalid="ignore", divide="ignore"):
+            refl_std = np.sqrt(daily_stats["refl_m2"] / (daily_stats["n_refl"] - 1)).where(daily_stats["n_refl"] > 1)
+        self.cygnss_daily_obs_df = pd.DataFrame({
+            "reflectivity": daily_stats["refl_mean"],
+            "incidence_angle": daily_stats["inc_mean"],
+            "n_points": n_points,
+            "reflectivity_std": refl_std,
+        })
 
     # ---------------------- 计划表 + EnKF + LHS ----------------------
     def _build_daily_plan(self):
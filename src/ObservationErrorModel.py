@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""GNSS-R 反射率观测误差模型。
+
+根据 ``knowledge/4.过程和测量误差协方差.md`` 第二部分, 观测误差方差由仪器噪声与
+代表性误差两部分组成, 且仪器噪声与反射率量级成正比。本模块按观测逐点构造 R 的
+对角元素 (方差数组), 全程向量化, 不生成稠密矩阵, 供 EnKF 分析步骤直接使用。
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+
+
+class ObservationErrorModel:
+    """由观测值与辅助信息逐点计算 R 对角方差。"""
+
+    def __init__(
+        self,
+        *,
+        instrument_db: float = 0.34,
+        representativeness_std: float = 0.01,
+        reference_incidence_deg: float = 40.0,
+        incidence_exponent: float = 1.0,
+        flagged_inflation: float = 4.0,
+        antenna_inflation: Mapping[int, float] | None = None,
+        min_variance: float = 1e-8,
+    ) -> None:
+        # 仪器噪声 (dB) 与代表性误差 (线性反射率标准差)
+        self.instrument_db = instrument_db
+        self.representativeness_std = representativeness_std
+
+        # 入射角修正: 方差按 (cos θ_ref / cos θ)^p 放大
+        self.reference_incidence_deg = reference_incidence_deg
+        self.incidence_exponent = incidence_exponent
+
+        # 质量标志与天线的方差放大系数, 未列出的天线视为无效观测
+        self.flagged_inflation = flagged_inflation
+        self.antenna_inflation = dict(antenna_inflation) if antenna_inflation is not None else {2: 1.0, 3: 1.0}
+        self.min_variance = min_variance
+
+    # ------------------------------------------------------------------ 辅助函数
+    def _instrument_variance(self, reflectivity: np.ndarray) -> np.ndarray:
+        """dB 不确定度转为线性方差: σ_Γ ≈ Γ·(10^(σ_dB/10) - 1)。"""
+
+        sigma = np.abs(reflectivity) * (10.0 ** (self.instrument_db / 10.0) - 1.0)
+        return sigma**2
+
+    def _incidence_factor(self, incidence_angle_deg: np.ndarray) -> np.ndarray:
+        """大入射角信噪比下降, 方差相对参考入射角放大。"""
+
+        cos_ref = np.cos(np.deg2rad(self.reference_incidence_deg))
+        cos_theta = np.maximum(np.cos(np.deg2rad(incidence_angle_deg)), 1e-3)
+        return (cos_ref / cos_theta) ** self.incidence_exponent
+
+    def _antenna_factor(self, ddm_ant: np.ndarray) -> np.ndarray:
+        """按天线编号查表得到放大系数, 未知天线返回 inf。"""
+
+        ant = np.asarray(ddm_ant, dtype=float)
+        factor = np.full(ant.shape, np.inf)
+        for code, inflation in self.antenna_inflation.items():
+            factor[ant == code] = inflation
+        return factor
+
+    # ------------------------------------------------------------------ 核心接口
+    def variances(
+        self,
+        reflectivity: np.ndarray | float,
+        *,
+        n_points: np.ndarray | float | None = None,
+        incidence_angle_deg: np.ndarray | float | None = None,
+        quality_flags_2: np.ndarray | float | None = None,
+        ddm_ant: np.ndarray | float | None = None,
+    ) -> np.ndarray:
+        """返回与观测对齐的 R 对角方差 (一维数组)。
+
+        ``n_points`` 为超级观测包含的点数, 仪器噪声按 1/n 缩减, 代表性误差不随点数
+        减小; 非有限或非正的点数按 1 处理。缺省或 NaN 的辅助量不参与修正;
+        无效观测对应的方差为 ``inf``。
+        """
+
+        refl = np.atleast_1d(np.asarray(reflectivity, dtype=float))
+        variance = self._instrument_variance(refl)
+
+        if n_points is not None:
+            count = np.broadcast_to(np.asarray(n_points, dtype=float), refl.shape)
+            count = np.where(np.isfinite(count) & (count > 0), count, 1.0)
+            variance = variance / np.maximum(count, 1.0)
+        variance = variance + self.representativeness_std**2
+
+        if incidence_angle_deg is not None:
+            inc = np.broadcast_to(np.asarray(incidence_angle_deg, dtype=float), refl.shape)
+            variance = variance * np.where(np.isfinite(inc), self._incidence_factor(inc), 1.0)
+        if quality_flags_2 is not None:
+            flags = np.broadcast_to(np.asarray(quality_flags_2, dtype=float), refl.shape)
+            flagged = np.isfinite(flags) & (flags != 0)
+            variance = np.where(flagged, variance * self.flagged_inflation, variance)
+        if ddm_ant is not None:
+            ant = np.broadcast_to(np.asarray(ddm_ant, dtype=float), refl.shape)
+            variance = variance * np.where(np.isfinite(ant), self._antenna_factor(ant), 1.0)
+
+        return np.maximum(variance, self.min_variance)
@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Mapping
 
 import numpy as np
 
+from ComputeBackend import as_parameter, numba, prange, resolve_backend
+
 
 def _debye_permittivity(frequency_hz: float, temperature_kelvin: float) -> complex:
     """使用单极 Debye 模型计算液态水的复介电常数。"""
@@ -22,36 +27,354 @@ def _debye_permittivity(frequency_hz: float, temperature_kelvin: float) -> compl
     return epsilon_infinity + (epsilon_static - epsilon_infinity) / (1.0 + 1j * omega * relaxation_time)
 
 
+@functools.lru_cache(maxsize=1024)
+def _sqrt_free_water_permittivity(frequency_hz: float, temperature_kelvin: float) -> complex:
+    """自由水介电常数的复平方根, 按 (频率, 温度) 记忆化。"""
+
+    return complex(np.sqrt(_debye_permittivity(frequency_hz, temperature_kelvin)))
+
+
+def _abs_squared(z: complex) -> float:
+    """``|z|²``, 不经 ``hypot`` 与平方。"""
+
+    return z.real * z.real + z.imag * z.imag
+
+
+def _complex_sqrt(z: complex) -> complex:
+    """主值复平方根, 只用实数 ``sqrt`` (数值稳定形式, 避免实部相消)。"""
+
+    modulus = np.sqrt(z.real * z.real + z.imag * z.imag)
+    if z.real >= 0.0:
+        t = np.sqrt(0.5 * (modulus + z.real))
+        return complex(t, z.imag / (2.0 * t)) if t > 0.0 else 0j
+    t = np.sqrt(0.5 * (modulus - z.real))
+    return complex(abs(z.imag) / (2.0 * t), t if z.imag >= 0.0 else -t)
+
+
+def _fused_reflectivity_kernel(
+    sm: np.ndarray,
+    vwc: np.ndarray,
+    porosity: np.ndarray,
+    theta_bound_max: np.ndarray,
+    bound_term_max: np.ndarray,
+    mix_solid: np.ndarray,
+    sqrt_eps_bound: complex,
+    sqrt_eps_free: complex,
+    cos_theta: float,
+    sin_theta_sq: float,
+    roughness_factor: float,
+    vegetation_b: float,
+    out: np.ndarray,
+) -> None:
+    """Mironov → Fresnel → 粗糙度 → 植被 单遍内核, 成员间并行, 逐成员写入 ``out``。
+
+    质地常数 (孔隙度、束缚水上限及其混合项、固相混合项) 为逐成员数组, 均一质地时
+    传入广播视图。束缚水未饱和时自由水项为零, 饱和后束缚水项为常数
+    ``bound_term_max``, 因此每个成员只需一次 ``ratio**0.65``; Fresnel 项使用与
+    ``run_parameter_sets`` 相同的无复数除法闭式。
+    """
+
+    g = 0.65
+    two_cos_sq = 2.0 * cos_theta * cos_theta
+    attenuation = -2.0 * vegetation_b / cos_theta
+    for i in prange(sm.shape[0]):
+        phi = max(porosity[i], 1e-6)
+        sm_i = min(max(sm[i], 1e-6), porosity[i] - 1e-6)
+        theta_free = sm_i - theta_bound_max[i]
+        if theta_free > 0.0:
+            free_ratio = min(theta_free / phi, 1.0)
+            mix = (
+                1.0
+                + mix_solid[i]
+                + bound_term_max[i] * (sqrt_eps_bound - 1.0)
+                + free_ratio**g * (sqrt_eps_free - 1.0)
+            )
+        else:
+            bound_ratio = min(max(sm_i / phi, 0.0), 1.0)
+            mix = 1.0 + mix_solid[i] + bound_ratio**g * (sqrt_eps_bound - 1.0)
+        epsilon = mix * mix
+
+        # r_vv - r_hh = 2·cosθ·s·(ε-1) / ((ε·cosθ + s)(cosθ + s))
+        sqrt_term = _complex_sqrt(epsilon - sin_theta_sq)
+        numerator = _abs_squared(sqrt_term) * _abs_squared(epsilon - 1.0)
+        denominator = _abs_squared(epsilon * cos_theta + sqrt_term) * _abs_squared(cos_theta + sqrt_term)
+        gamma_smooth = two_cos_sq * numerator / denominator
+
+        out[i] = gamma_smooth * roughness_factor * np.exp(attenuation * vwc[i])
+
+
+if numba is not None:
+    _abs_squared = numba.njit(inline="always")(_abs_squared)
+    _complex_sqrt = numba.njit(inline="always")(_complex_sqrt)
+    _fused_reflectivity_kernel = numba.njit(parallel=True, cache=True)(_fused_reflectivity_kernel)
+
+
 @dataclass
 class ObservationParams:
-    """观测模型所需的辅助参数。"""
+    """观测模型所需的辅助参数。
+
+    各字段可为标量, 也可为长度 m 的数组 (逐观测几何, 如 CYGNSS 各镜面点的
+    ``sp_inc_angle``); 数组之间按 numpy 规则广播。
+    """
+
+    incidence_angle_deg: float | np.ndarray  # 入射角 (deg)
+    surface_rms_height_m: float | np.ndarray  # 地表均方根高度 (m)
+    vegetation_b: float | np.ndarray  # VWC 到 VOD 的线性系数
+    temperature_kelvin: float | np.ndarray  # 土壤温度 (K)
+
+
+class ReflectivityLookupTable:
+    """光滑表面反射率 ``gamma_smooth(SM, θ, T)`` 的三维查找表。
+
+    质地固定后, Mironov → Debye → Fresnel 链只依赖土壤湿度、入射角与土壤温度。
+    查找表在均匀网格上一次性由精确算子构建, 之后用向量化三线性插值求值;
+    越界输入截断到网格范围 (与精确算子对 SM 的截断一致)。构建后在随机点与
+    网格中点上对照精确算子, 最大绝对误差超过 ``tolerance`` 时报错。
+
+    SM 轴不直接使用 SM, 而使用 ``q = bound_ratio**g + free_ratio**g``: Mironov 混合项
+    对 q 分段线性, 避免 ``ratio**0.65`` 在零点附近斜率发散带来的插值误差;
+    束缚水/自由水分界点恰好落在网格节点上。
+    """
+
+    def __init__(
+        self,
+        model: "ObservationModel",
+        *,
+        n_sm: int = 256,
+        incidence_range_deg: tuple[float, float] = (0.0, 70.0),
+        n_incidence: int = 71,
+        temperature_range_k: tuple[float, float] = (263.15, 323.15),
+        n_temperature: int = 31,
+        tolerance: float = 1e-3,
+        cache_dir: str | Path | None = None,
+    ) -> None:
+        # SM 坐标变换所需的质地常数
+        constants = model._texture_constants()
+        self.porosity = model.porosity
+        self.phi = constants["phi"]
+        self.theta_bound_max = constants["theta_bound_max"]
+        self.q_grid = self._q_grid(n_sm)
+        self.incidence_grid = np.linspace(*incidence_range_deg, n_incidence)
+        self.temperature_grid = np.linspace(*temperature_range_k, n_temperature)
+        self.tolerance = tolerance
+
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / f"gamma_lut_{self._cache_key(model)}.npz"
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path) as cached:
+                self.table = cached["table"]
+        else:
+            self.table = self._build(model)
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                np.savez_compressed(cache_path, table=self.table)
+
+        self.max_error = self.validate(model)
+        if self.max_error > tolerance:
+            raise ValueError(
+                f"查找表最大误差 {self.max_error:.2e} 超过阈值 {tolerance:.2e}, 请加密网格。"
+            )
+
+    def _cache_key(self, model: "ObservationModel") -> str:
+        """由质地常数与网格定义生成缓存文件名。"""
+
+        spec = (
+            model.sand_fraction,
+            model.clay_fraction,
+            model.porosity,
+            model.bound_water_factor,
+            model.frequency_hz,
+            tuple(self.q_grid[[0, -1]]),
+            self.q_grid.size,
+            tuple(self.incidence_grid[[0, -1]]),
+            self.incidence_grid.size,
+            tuple(self.temperature_grid[[0, -1]]),
+            self.temperature_grid.size,
+        )
+        return hashlib.sha1(repr(spec).encode("utf-8")).hexdigest()[:16]
+
+    def sm_coordinate(self, sm: np.ndarray) -> np.ndarray:
+        """SM → q 变换, 截断方式与 ``ObservationModel._mironov_dielectric`` 一致。
+
+        分界点两侧只有一项非零, 因此每个元素只需一次幂运算。
+        """
+
+        g = 0.65
+        sm = np.clip(sm, 1e-6, self.porosity - 1e-6)
+        free = sm > self.theta_bound_max
+        base = np.where(free, sm - self.theta_bound_max, sm) / self.phi
+        q = np.minimum(base, 1.0) ** g
+        q_kink = min(self.theta_bound_max / self.phi, 1.0) ** g
+        return np.where(free, q + q_kink, q)
+
+    def _sm_from_coordinate(self, q: np.ndarray) -> np.ndarray:
+        """q → SM 的逆变换, 用于在 q 网格节点上构建查找表。"""
+
+        g = 0.65
+        q_kink = min(self.theta_bound_max / self.phi, 1.0) ** g
+        below = self.phi * np.clip(q, 0.0, q_kink) ** (1.0 / g)
+        above = self.phi * np.maximum(q - q_kink, 0.0) ** (1.0 / g)
+        return np.where(q <= q_kink, below, self.theta_bound_max + above)
+
+    def _q_grid(self, n_sm: int) -> np.ndarray:
+        """均匀 q 网格, 步长取整使束缚水分界点落在节点上。"""
+
+        g = 0.65
+        q_min, q_max = self.sm_coordinate(np.array([1e-6, self.porosity - 1e-6]))
+        q_kink = min(self.theta_bound_max / self.phi, 1.0) ** g
+        if q_min < q_kink < q_max:
+            m = max(1, int(round((q_kink - q_min) / (q_max - q_min) * (n_sm - 1))))
+            step = (q_kink - q_min) / m
+        else:
+            step = (q_max - q_min) / (n_sm - 1)
+        n_nodes = int(np.ceil((q_max - q_min) / step - 1e-9)) + 1
+        return q_min + step * np.arange(max(n_nodes, 2))
+
+    def _build(self, model: "ObservationModel") -> np.ndarray:
+        """按温度逐层调用精确算子, 返回 ``(n_sm, n_incidence, n_temperature)`` 表。"""
+
+        sm_nodes = self._sm_from_coordinate(self.q_grid)
+        theta_rad = np.deg2rad(self.incidence_grid)[None, :]
+        table = np.empty((self.q_grid.size, self.incidence_grid.size, self.temperature_grid.size))
+        for k, temperature in enumerate(self.temperature_grid):
+            epsilon = model._mironov_dielectric(sm_nodes, float(temperature))
+            table[:, :, k] = model._fresnel_cross_pol(epsilon[:, None], theta_rad)
+        return table
+
+    @staticmethod
+    def _locate(grid: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """均匀网格上的下标与插值权重。"""
+
+        step = grid[1] - grid[0]
+        position = (np.clip(values, grid[0], grid[-1]) - grid[0]) / step
+        index = np.minimum(position.astype(np.intp), grid.size - 2)
+        return index, position - index
+
+    def evaluate(
+        self,
+        sm: np.ndarray,
+        incidence_angle_deg: float | np.ndarray,
+        temperature_kelvin: float | np.ndarray,
+    ) -> np.ndarray:
+        """三线性插值求 ``gamma_smooth``, 三个输入按 numpy 规则广播。
+
+        入射角与温度均为标量时, 先在 (θ, T) 上双线性折叠为一维 q 剖面, 再用
+        ``np.interp`` 对全部成员插值。
+        """
+
+        if np.ndim(incidence_angle_deg) == 0 and np.ndim(temperature_kelvin) == 0:
+            j, wj = self._locate(self.incidence_grid, np.asarray(incidence_angle_deg, dtype=float))
+            k, wk = self._locate(self.temperature_grid, np.asarray(temperature_kelvin, dtype=float))
+            corner = self.table[:, j : j + 2, k : k + 2]
+            weights = np.array([[(1.0 - wj) * (1.0 - wk), (1.0 - wj) * wk], [wj * (1.0 - wk), wj * wk]])
+            profile = np.tensordot(corner, weights, axes=([1, 2], [0, 1]))
+            return np.interp(self.sm_coordinate(np.asarray(sm, dtype=float)), self.q_grid, profile)
+
+        sm, inc, temp = np.broadcast_arrays(
+            np.asarray(sm, dtype=float),
+            np.asarray(incidence_angle_deg, dtype=float),
+            np.asarray(temperature_kelvin, dtype=float),
+        )
+        i, wi = self._locate(self.q_grid, self.sm_coordinate(sm))
+        j, wj = self._locate(self.incidence_grid, inc)
+        k, wk = self._locate(self.temperature_grid, temp)
+
+        # 在展平的表上按线性下标取 8 个角点, 比三维花式索引少一半开销
+        flat = self.table.ravel()
+        stride_i = self.table.shape[1] * self.table.shape[2]
+        stride_j = self.table.shape[2]
+        base = i * stride_i + j * stride_j + k
+
+        def corner(offset: int) -> np.ndarray:
+            return flat.take(base + offset)
+
+        c00 = corner(0) * (1.0 - wi) + corner(stride_i) * wi
+        c10 = corner(stride_j) * (1.0 - wi) + corner(stride_i + stride_j) * wi
+        c01 = corner(1) * (1.0 - wi) + corner(stride_i + 1) * wi
+        c11 = corner(stride_j + 1) * (1.0 - wi) + corner(stride_i + stride_j + 1) * wi
+        c0 = c00 * (1.0 - wj) + c10 * wj
+        c1 = c01 * (1.0 - wj) + c11 * wj
+        return c0 * (1.0 - wk) + c1 * wk
+
+    def validate(self, model: "ObservationModel", n_samples: int = 2000, seed: int = 0) -> float:
+        """在随机点与网格中点上对照精确算子, 返回最大绝对误差。"""
 
-    incidence_angle_deg: float  # 入射角 (deg)
-    surface_rms_height_m: float  # 地表均方根高度 (m)
-    vegetation_b: float  # VWC 到 VOD 的线性系数
-    temperature_kelvin: float  # 土壤温度 (K)
+        rng = np.random.default_rng(seed)
+        sm_nodes = self._sm_from_coordinate(self.q_grid)
+        sm = np.concatenate([
+            rng.uniform(1e-6, self.porosity - 1e-6, n_samples),
+            0.5 * (sm_nodes[:-1] + sm_nodes[1:]),
+        ])
+        inc = np.concatenate([
+            rng.uniform(self.incidence_grid[0], self.incidence_grid[-1], n_samples),
+            np.resize(0.5 * (self.incidence_grid[:-1] + self.incidence_grid[1:]), sm.size - n_samples),
+        ])
+        temp = np.concatenate([
+            rng.uniform(self.temperature_grid[0], self.temperature_grid[-1], n_samples),
+            np.resize(0.5 * (self.temperature_grid[:-1] + self.temperature_grid[1:]), sm.size - n_samples),
+        ])
+
+        exact = np.empty(sm.size)
+        for idx in range(sm.size):
+            epsilon = model._mironov_dielectric(sm[idx : idx + 1], float(temp[idx]))
+            exact[idx] = model._fresnel_cross_pol(epsilon, np.deg2rad(inc[idx]))[0]
+        return float(np.max(np.abs(self.evaluate(sm, inc, temp) - exact)))
 
 
 class ObservationModel:
-    """将 ``[SM, VWC]`` 状态映射成 GNSS-R 反射率。"""
+    """将 ``[SM, VWC]`` 状态映射成 GNSS-R 反射率。
+
+    ``sand_fraction``、``clay_fraction`` 与 ``bulk_density`` 可为标量, 也可为沿像元轴
+    的一维数组 (逐像元孔隙度与束缚水上限随之变化)。逐像元质地通过 ``pixel_index``
+    映射到集合成员, 约定与 ``ProcessModel`` 相同; 质地相关常数按不同的质地类别
+    各计算一次。
+    """
+
+    # 修改这些属性会使缓存的质地常数与查找表失效
+    _TEXTURE_ATTRIBUTES = frozenset(
+        {
+            "sand_fraction",
+            "clay_fraction",
+            "bulk_density",
+            "particle_density",
+            "frequency_hz",
+            "bound_water_factor",
+            "porosity",
+        }
+    )
+
+    # run_parameter_sets 接受的参数表列名 (含 lhs_params.csv 的简写), 按优先级排列
+    PARAMETER_ALIASES = {
+        "incidence_angle_deg": "incidence_angle_deg",
+        "inc_angle": "incidence_angle_deg",
+        "surface_rms_height_m": "surface_rms_height_m",
+        "rms_h": "surface_rms_height_m",
+        "vegetation_b": "vegetation_b",
+        "veg_b": "vegetation_b",
+        "temperature_kelvin": "temperature_kelvin",
+    }
 
     def __init__(
         self,
         *,
-        sand_fraction: float,
-        clay_fraction: float,
-        bulk_density: float = 1.3,
+        sand_fraction: float | np.ndarray,
+        clay_fraction: float | np.ndarray,
+        bulk_density: float | np.ndarray = 1.3,
         particle_density: float = 2.65,
         frequency_hz: float = 1.57542e9,
         default_incidence_angle_deg: float = 40.0,
         vegetation_b: float = 0.12,
         surface_rms_height_m: float = 0.01,
         bound_water_factor: float = 0.3,
+        pixel_index: np.ndarray | None = None,
+        backend: str = "numpy",
     ) -> None:
-        # 土壤质地与物理常数
-        self.sand_fraction = sand_fraction
-        self.clay_fraction = clay_fraction
-        self.bulk_density = bulk_density
+        # 土壤质地与物理常数 (标量或逐像元数组)
+        self.sand_fraction = as_parameter(sand_fraction)
+        self.clay_fraction = as_parameter(clay_fraction)
+        self.bulk_density = as_parameter(bulk_density)
+        # 赋值 particle_density 时由 __setattr__ 派生孔隙度 porosity, 用于划分束缚水与自由水
         self.particle_density = particle_density
         self.frequency_hz = frequency_hz
 
@@ -61,35 +384,145 @@ class ObservationModel:
         self.default_surface_rms_height = surface_rms_height_m
         self.bound_water_factor = bound_water_factor
 
-        # 土壤孔隙度, 用于划分束缚水与自由水
-        self.porosity = 1.0 - bulk_density / particle_density
+        # 集合成员 → 像元的映射, 仅在使用逐像元质地时需要
+        self.pixel_index = None if pixel_index is None else np.asarray(pixel_index, dtype=np.intp)
 
-    # ------------------------------------------------------- 介电常数与反射率
-    def _mironov_dielectric(self, sm: np.ndarray, temperature_kelvin: float) -> np.ndarray:
-        """Mironov(2009) 模型: 由 SM 推导复介电常数。"""
+        # 计算后端: "numpy" 为参考实现, "numba" 为单遍融合内核, "auto" 在可用时选 numba
+        self.backend = resolve_backend(backend)
 
-        sm = np.clip(sm, 1e-6, self.porosity - 1e-6)
-        epsilon_soil_solid = 4.7 - 0.62j * self.clay_fraction
-        epsilon_free = _debye_permittivity(self.frequency_hz, temperature_kelvin)
+        # 可选的 gamma_smooth 查找表, 由 enable_lut() 构建
+        self.lut: ReflectivityLookupTable | None = None
+
+    def enable_lut(self, **kwargs) -> ReflectivityLookupTable:
+        """构建 (或从磁盘缓存读取) 光滑表面反射率查找表, 之后 run() 以插值代替精确算子。
+
+        关键字参数透传给 ``ReflectivityLookupTable``。查找表的 SM 轴依赖质地,
+        仅支持均一质地; 之后修改质地或频率会丢弃查找表。
+        """
+
+        if self._texture_constants()["pixel_class"] is not None:
+            raise ValueError("查找表仅支持均一质地, 逐像元质地请使用精确算子")
+        self.lut = ReflectivityLookupTable(self, **kwargs)
+        return self.lut
+
+    def disable_lut(self) -> None:
+        """恢复使用精确算子。"""
+
+        self.lut = None
+
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        if name in ("bulk_density", "particle_density") and "particle_density" in self.__dict__:
+            # 孔隙度由两种密度派生, 任一变化时同步更新
+            super().__setattr__("porosity", 1.0 - self.bulk_density / self.particle_density)
+        if name in self._TEXTURE_ATTRIBUTES:
+            self.__dict__.pop("_texture_cache", None)
+            # 查找表按旧质地构建, 丢弃后回到精确算子, 需要时重新 enable_lut()
+            self.__dict__["lut"] = None
+
+    # ------------------------------------------------------------- 常数缓存
+    def _texture_constants(self) -> dict[str, float | complex | np.ndarray | None]:
+        """只依赖质地的 Mironov 常数, 首次使用时计算, 相关属性被修改后重新计算。
+
+        逐像元质地先按 (粘粒含量, 孔隙度) 去重, 常数按类别存放, ``pixel_class``
+        给出每个像元所属类别; 均一质地时常数为标量, ``pixel_class`` 为 None。
+        """
+
+        cached = self.__dict__.get("_texture_cache")
+        if cached is not None:
+            return cached
+
+        g = 0.65
         epsilon_bound = 7.0 - 0.8j
+        if np.ndim(self.clay_fraction) == 0 and np.ndim(self.porosity) == 0:
+            phi = max(self.porosity, 1e-6)
+            epsilon_soil_solid = 4.7 - 0.62j * self.clay_fraction
+            theta_bound_max = self.bound_water_factor * self.clay_fraction * self.porosity
+            constants = {
+                "porosity": self.porosity,
+                "phi": phi,
+                "theta_bound_max": theta_bound_max,
+                "bound_term_max": min(max(theta_bound_max / phi, 0.0), 1.0) ** g,
+                "mix_solid": complex((1.0 - phi) ** g * (np.sqrt(epsilon_soil_solid) - 1.0)),
+                "sqrt_eps_bound": complex(np.sqrt(epsilon_bound)),
+                "pixel_class": None,
+            }
+        else:
+            clay, porosity = np.broadcast_arrays(self.clay_fraction, self.porosity)
+            classes, pixel_class = np.unique(np.stack([clay, porosity], axis=1), axis=0, return_inverse=True)
+            clay, porosity = classes[:, 0], classes[:, 1]
+            phi = np.maximum(porosity, 1e-6)
+            theta_bound_max = self.bound_water_factor * clay * porosity
+            constants = {
+                "porosity": porosity,
+                "phi": phi,
+                "theta_bound_max": theta_bound_max,
+                "bound_term_max": np.clip(theta_bound_max / phi, 0.0, 1.0) ** g,
+                "mix_solid": (1.0 - phi) ** g * (np.sqrt(4.7 - 0.62j * clay) - 1.0),
+                "sqrt_eps_bound": complex(np.sqrt(epsilon_bound)),
+                "pixel_class": pixel_class.reshape(-1),
+            }
+        self.__dict__["_texture_cache"] = constants
+        return constants
+
+    def member_texture(self, pixel_index: np.ndarray | None = None) -> dict[str, float | complex | np.ndarray]:
+        """按 ``pixel_index`` 将质地常数收集为逐成员数组, 均一质地时原样返回标量。"""
+
+        constants = self._texture_constants()
+        pixel_class = constants["pixel_class"]
+        if pixel_class is None:
+            return constants
+
+        index = self.pixel_index if pixel_index is None else np.asarray(pixel_index, dtype=np.intp)
+        member_class = pixel_class if index is None else pixel_class[index]
+        texture = {name: constants[name][member_class] for name in ("porosity", "phi", "theta_bound_max", "bound_term_max", "mix_solid")}
+        texture["sqrt_eps_bound"] = constants["sqrt_eps_bound"]
+        return texture
+
+    def _sqrt_eps_free(self, temperature_kelvin: float | np.ndarray) -> complex | np.ndarray:
+        """自由水介电常数的平方根。
+
+        标量温度走 LRU 缓存; 温度数组先 ``np.unique`` 去重, 只对不同取值求 Debye 模型,
+        再按逆索引还原成原形状。
+        """
+
+        if np.ndim(temperature_kelvin) == 0:
+            return _sqrt_free_water_permittivity(float(self.frequency_hz), float(temperature_kelvin))
 
-        theta_bound = np.minimum(self.bound_water_factor * self.clay_fraction * self.porosity, sm)
+        temperature = np.asarray(temperature_kelvin, dtype=float)
+        unique, inverse = np.unique(temperature, return_inverse=True)
+        roots = np.sqrt(_debye_permittivity(self.frequency_hz, unique))
+        return roots[inverse].reshape(temperature.shape)
+
+    # ------------------------------------------------------- 介电常数与反射率
+    def _mironov_dielectric(
+        self,
+        sm: np.ndarray,
+        temperature_kelvin: float | np.ndarray,
+        texture: Mapping[str, float | complex | np.ndarray] | None = None,
+    ) -> np.ndarray:
+        """Mironov(2009) 模型: 由 SM 推导复介电常数。
+
+        温度可为标量或与 SM 对齐的数组; ``texture`` 为 ``member_texture`` 给出的
+        质地常数, 缺省时使用 ``self.pixel_index`` 对应的成员质地。
+        """
+
+        constants = self.member_texture() if texture is None else texture
+        sm = np.clip(sm, 1e-6, constants["porosity"] - 1e-6)
+
+        theta_bound = np.minimum(constants["theta_bound_max"], sm)
         theta_free = np.maximum(sm - theta_bound, 0.0)
 
         g = 0.65
-        phi = max(self.porosity, 1e-6)
+        phi = constants["phi"]
         bound_ratio = np.clip(theta_bound / phi, 0.0, 1.0)
         free_ratio = np.clip(theta_free / phi, 0.0, 1.0)
 
-        sqrt_eps_solid = np.sqrt(epsilon_soil_solid)
-        sqrt_eps_bound = np.sqrt(epsilon_bound)
-        sqrt_eps_free = np.sqrt(epsilon_free)
-
         mix = (
             1.0
-            + (1.0 - phi) ** g * (sqrt_eps_solid - 1.0)
-            + bound_ratio**g * (sqrt_eps_bound - 1.0)
-            + free_ratio**g * (sqrt_eps_free - 1.0)
+            + constants["mix_solid"]
+            + bound_ratio**g * (constants["sqrt_eps_bound"] - 1.0)
+            + free_ratio**g * (self._sqrt_eps_free(temperature_kelvin) - 1.0)
         )
         return mix**2
 
@@ -104,13 +537,59 @@ class ObservationModel:
         r_vv = (epsilon * cos_theta - sqrt_term) / (epsilon * cos_theta + sqrt_term)
         return 0.5 * np.abs(r_vv - r_hh) ** 2
 
+    def _run_fused(
+        self,
+        sm: np.ndarray,
+        vwc: np.ndarray,
+        params: ObservationParams,
+        texture: Mapping[str, float | complex | np.ndarray],
+    ) -> np.ndarray:
+        """准备常数并调用编译内核, 避免逐步生成中间数组。"""
+
+        n_members = sm.shape[0]
+
+        def member_array(value, dtype=float):
+            return np.broadcast_to(np.asarray(value, dtype=dtype), (n_members,))
+
+        theta_rad = np.deg2rad(params.incidence_angle_deg)
+        cos_theta = float(np.cos(theta_rad))
+        wavelength = 299792458.0 / self.frequency_hz
+        k = 2.0 * np.pi / wavelength
+        h = (2.0 * k * params.surface_rms_height_m) ** 2 * cos_theta**2
+
+        out = np.empty(n_members)
+        _fused_reflectivity_kernel(
+            np.ascontiguousarray(sm),
+            np.ascontiguousarray(vwc),
+            member_array(texture["porosity"]),
+            member_array(texture["theta_bound_max"]),
+            member_array(texture["bound_term_max"]),
+            member_array(texture["mix_solid"], complex),
+            texture["sqrt_eps_bound"],
+            self._sqrt_eps_free(params.temperature_kelvin),
+            cos_theta,
+            float(np.sin(theta_rad) ** 2),
+            float(np.exp(-h)),
+            float(params.vegetation_b),
+            out,
+        )
+        return out
+
     # ------------------------------------------------------------ 对外接口
     def run(
         self,
         state: np.ndarray,
         params: ObservationParams | Mapping[str, float] | None = None,
+        pixel_index: np.ndarray | None = None,
     ) -> np.ndarray:
-        """将状态向量映射到观测空间。支持单个状态与集合。"""
+        """将状态向量映射到观测空间。支持单个状态与集合。
+
+        观测参数全为标量时, 集合输入返回 ``(N,)``; 任一参数为长度 m 的数组时, 返回
+        成员 × 观测的 ``(N, m)`` 预测观测矩阵 (单个状态返回 ``(m,)``), 一次调用即可
+        得到一天内全部镜面点的预测值。逐观测几何始终走向量化的 numpy/查找表路径。
+
+        ``pixel_index`` 缺省时使用构造时给出的 ``self.pixel_index``。
+        """
 
         if params is None:
             observation_params = ObservationParams(
@@ -131,17 +610,111 @@ class ObservationModel:
         sm = ensemble[:, 0]
         vwc = ensemble[:, 1]
 
-        epsilon = self._mironov_dielectric(sm, observation_params.temperature_kelvin)
-        theta_rad = np.deg2rad(observation_params.incidence_angle_deg)
-        gamma_smooth = self._fresnel_cross_pol(epsilon, theta_rad)
+        incidence = np.asarray(observation_params.incidence_angle_deg, dtype=float)
+        rms_height = np.asarray(observation_params.surface_rms_height_m, dtype=float)
+        vegetation_b = np.asarray(observation_params.vegetation_b, dtype=float)
+        temperature = np.asarray(observation_params.temperature_kelvin, dtype=float)
+        obs_shape = np.broadcast_shapes(incidence.shape, rms_height.shape, vegetation_b.shape, temperature.shape)
+        texture = self.member_texture(pixel_index)
+
+        if obs_shape:
+            # 成员沿第 0 轴, 观测沿其后各轴
+            member_shape = (-1,) + (1,) * len(obs_shape)
+            sm = sm.reshape(member_shape)
+            vwc = vwc.reshape(member_shape)
+            texture = {
+                name: value.reshape(member_shape) if isinstance(value, np.ndarray) else value
+                for name, value in texture.items()
+            }
+        elif self.backend == "numba" and self.lut is None:
+            reflectivity = self._run_fused(sm, vwc, observation_params, texture)
+            return reflectivity[0] if was_one_dimensional else reflectivity
+
+        theta_rad = np.deg2rad(incidence)
+        if self.lut is not None:
+            gamma_smooth = self.lut.evaluate(sm, incidence, temperature)
+        else:
+            epsilon = self._mironov_dielectric(sm, temperature, texture)
+            gamma_smooth = self._fresnel_cross_pol(epsilon, theta_rad)
 
         wavelength = 299792458.0 / self.frequency_hz
         k = 2.0 * np.pi / wavelength
-        h = (2.0 * k * observation_params.surface_rms_height_m) ** 2 * np.cos(theta_rad) ** 2
+        h = (2.0 * k * rms_height) ** 2 * np.cos(theta_rad) ** 2
         roughness_factor = np.exp(-h)
 
-        tau = observation_params.vegetation_b * vwc
+        tau = vegetation_b * vwc
         vegetation_factor = np.exp(-2.0 * tau / np.cos(theta_rad))
 
         reflectivity = gamma_smooth * roughness_factor * vegetation_factor
         return reflectivity[0] if was_one_dimensional else reflectivity
+
+    def run_parameter_sets(
+        self,
+        state: np.ndarray,
+        parameter_sets,
+        pixel_index: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """在集合 × 参数表的笛卡尔积上求观测算子, 返回 ``(n_params, N)``。
+
+        ``parameter_sets`` 为 DataFrame 或列名到数组的映射, 列名可用 ``ObservationParams``
+        字段名, 也可用 ``lhs_params.csv`` 的 ``inc_angle``/``rms_h``/``veg_b``; 缺失的列
+        取模型默认值 (温度默认 295 K)。介电常数只按不同温度各算一次, 光滑表面反射率
+        只按不同 (入射角, 温度) 组合各算一次, 粗糙度与植被衰减按参数组广播。
+        """
+
+        columns = {}
+        for alias, name in self.PARAMETER_ALIASES.items():
+            if name not in columns and alias in parameter_sets:
+                columns[name] = np.asarray(parameter_sets[alias], dtype=float).reshape(-1)
+        n_params = max((len(values) for values in columns.values()), default=1)
+        defaults = {
+            "incidence_angle_deg": self.default_incidence_angle,
+            "surface_rms_height_m": self.default_surface_rms_height,
+            "vegetation_b": self.default_vegetation_b,
+            "temperature_kelvin": 295.0,
+        }
+        incidence, rms_height, vegetation_b, temperature = (
+            np.broadcast_to(columns.get(name, defaults[name]), (n_params,)) for name in defaults
+        )
+
+        state = np.asarray(state, dtype=float)
+        ensemble = state.reshape(1, -1) if state.ndim == 1 else state
+        sm = ensemble[:, 0]
+        vwc = ensemble[:, 1]
+        texture = self.member_texture(pixel_index)
+
+        # 与参数组无关的部分: 按不同 (入射角, 温度) 组合求光滑表面反射率
+        geometry, geometry_index = np.unique(np.stack([incidence, temperature], axis=1), axis=0, return_inverse=True)
+        gamma_smooth = np.empty((geometry.shape[0], sm.shape[0]))
+        if self.lut is not None:
+            gamma_smooth[:] = self.lut.evaluate(sm[None, :], geometry[:, :1], geometry[:, 1:])
+        else:
+
+            def abs_squared(z: np.ndarray) -> np.ndarray:
+                return z.real**2 + z.imag**2
+
+            # r_vv - r_hh = 2·cosθ·s·(ε-1) / ((ε·cosθ + s)(cosθ + s)), |ε-1|² 只依赖成员;
+            # 逐组合按行求值, 比一次性生成 (组合数, N) 的复数中间数组更省内存带宽
+            for temperature_value in np.unique(geometry[:, 1]):
+                epsilon = self._mironov_dielectric(sm, float(temperature_value), texture)
+                epsilon_term = abs_squared(epsilon - 1.0)
+                for row in np.flatnonzero(geometry[:, 1] == temperature_value):
+                    theta_rad = np.deg2rad(geometry[row, 0])
+                    cos_theta = np.cos(theta_rad)
+                    sqrt_term = np.sqrt(epsilon - np.sin(theta_rad) ** 2)
+                    gamma_smooth[row] = (
+                        2.0
+                        * cos_theta**2
+                        * abs_squared(sqrt_term)
+                        * epsilon_term
+                        / (abs_squared(epsilon * cos_theta + sqrt_term) * abs_squared(cos_theta + sqrt_term))
+                    )
+
+        # 与参数组相关的部分: 每组一个粗糙度因子, 植被衰减按 (参数组, 成员) 广播
+        cos_theta = np.cos(np.deg2rad(incidence))[:, None]
+        k = 2.0 * np.pi * self.frequency_hz / 299792458.0
+        roughness_factor = np.exp(-((2.0 * k * rms_height[:, None]) ** 2) * cos_theta**2)
+        vegetation_factor = np.exp(-2.0 * vegetation_b[:, None] * vwc[None, :] / cos_theta)
+
+        reflectivity = gamma_smooth[geometry_index.reshape(-1)] * roughness_factor * vegetation_factor
+        return reflectivity[:, 0] if state.ndim == 1 else reflectivity
@@ -8,129 +8,602 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Mapping
+from typing import Mapping, Sequence
 
 import numpy as np
 
+from ComputeBackend import as_parameter, numba, prange, resolve_backend
+
 
 @dataclass
 class ForcingInputs:
     """单步过程模型所需的气象强迫。"""
 
-    precipitation: float  # 每步降水量 (mm)
-    pet: float  # 每步潜在蒸散发量 (mm)
-    temperature: float  # 日平均气温 (°C)
-    doy: float  # 年积日 (1-366)
+    precipitation: float  # 降水强度 (mm/day), 日步长时即每步降水量
+    pet: float  # 潜在蒸散发强度 (mm/day)
+    temperature: float  # 步长内平均气温 (°C)
+    doy: float  # 年积日 (1-366), 小时步长时可带小数
+
+
+class ForcingTable:
+    """列式气象强迫表, 每个变量保存为连续的 numpy 数组。
+
+    取代逐行 ``iterrows`` + ``ForcingInputs`` 的组织方式: ``row(k)`` 返回按
+    ``FIELDS`` 顺序排列的只读视图, 可直接传给 ``ProcessModel.run``。各列形状为
+    ``(T,)`` (所有成员共享) 或 ``(T, N)`` (逐成员扰动后的强迫)。
+    """
+
+    FIELDS = ("precipitation", "pet", "temperature", "doy")
+
+    def __init__(
+        self,
+        precipitation: Sequence[float] | np.ndarray,
+        pet: Sequence[float] | np.ndarray,
+        temperature: Sequence[float] | np.ndarray,
+        doy: Sequence[float] | np.ndarray,
+        index: Sequence | None = None,
+    ) -> None:
+        columns = [np.ascontiguousarray(col, dtype=float) for col in (precipitation, pet, temperature, doy)]
+        lengths = {col.shape[0] for col in columns}
+        if len(lengths) != 1:
+            raise ValueError("强迫变量长度不一致。")
+        for col in columns:
+            col.flags.writeable = False
+
+        self.columns = tuple(columns)
+        self.index = index
+
+    @classmethod
+    def from_frame(cls, frame) -> "ForcingTable":
+        """由含 precipitation/pet/temperature/doy 列的 DataFrame 构造 (保留其索引)。"""
+
+        return cls(*(frame[name].to_numpy(dtype=float) for name in cls.FIELDS), index=frame.index)
+
+    @classmethod
+    def from_inputs(cls, inputs: Sequence[ForcingInputs]) -> "ForcingTable":
+        """由 ``ForcingInputs`` 列表构造。"""
+
+        return cls(*([getattr(item, name) for item in inputs] for name in cls.FIELDS))
+
+    def __len__(self) -> int:
+        return self.columns[0].shape[0]
+
+    def row(self, k: int) -> tuple:
+        """第 k 步强迫的视图 ``(precipitation, pet, temperature, doy)``。"""
+
+        return tuple(col[k] for col in self.columns)
+
+    @property
+    def precipitation(self) -> np.ndarray:
+        return self.columns[0]
+
+    @property
+    def pet(self) -> np.ndarray:
+        return self.columns[1]
+
+    @property
+    def temperature(self) -> np.ndarray:
+        return self.columns[2]
+
+    @property
+    def doy(self) -> np.ndarray:
+        return self.columns[3]
+
+
+class ForcingPerturbation:
+    """成批预生成逐成员的强迫扰动, 用于以强迫不确定性代替部分加性 Q。
+
+    降水采用均值为 1 的乘性对数正态扰动 (``knowledge/4.过程和测量误差协方差.md``
+    中 Q 的主导项), PET 采用乘性正态扰动, 气温采用加性正态扰动。``autocorrelation``
+    为扰动在时间上的 AR(1) 系数。
+
+    各扰动序列的末行保存在对象上, 对流式强迫窗口连续调用 ``draw`` 时 AR(1) 过程
+    跨窗口延续; 开始新的独立序列前调用 ``reset``。
+    """
+
+    def __init__(
+        self,
+        *,
+        precip_log_std: float = 0.5,
+        pet_rel_std: float = 0.1,
+        temperature_std: float = 0.0,
+        autocorrelation: float = 0.0,
+    ) -> None:
+        self.precip_log_std = precip_log_std
+        self.pet_rel_std = pet_rel_std
+        self.temperature_std = temperature_std
+        self.autocorrelation = autocorrelation
+
+        # 上一次 draw 中各扰动序列的末行 (按变量名), 供下一窗口延续 AR(1)
+        self._last_normals: dict[str, np.ndarray] = {}
+
+    def reset(self) -> None:
+        """丢弃跨窗口保存的扰动状态, 下一次 ``draw`` 重新开始序列。"""
+
+        self._last_normals.clear()
+
+    def _correlated_normals(self, rng: np.random.Generator, shape: tuple[int, int], name: str) -> np.ndarray:
+        """生成 ``(T, N)`` 标准正态序列, 沿时间轴施加 AR(1) 相关且保持单位方差。
+
+        若上一窗口留有同一变量、同样成员数的末行, 首行由其延续而非重新起步。
+        """
+
+        z = rng.standard_normal(shape)
+        rho = self.autocorrelation
+        if rho != 0.0 and shape[0] > 0:
+            innovation_scale = np.sqrt(1.0 - rho**2)
+            previous = self._last_normals.get(name)
+            if previous is not None and previous.shape == z[0].shape:
+                z[0] = rho * previous + innovation_scale * z[0]
+            for k in range(1, shape[0]):
+                z[k] = rho * z[k - 1] + innovation_scale * z[k]
+            self._last_normals[name] = z[-1].copy()
+        return z
+
+    def draw(
+        self,
+        forcings: ForcingTable,
+        ensemble_size: int,
+        seed: int | np.random.Generator | None = None,
+    ) -> ForcingTable:
+        """对 ``(T,)`` 强迫一次性抽取 ``(T, N)`` 扰动, 返回逐成员的强迫表。"""
+
+        rng = np.random.default_rng(seed)
+        shape = (len(forcings), ensemble_size)
+
+        sigma = self.precip_log_std
+        precip_factor = np.exp(sigma * self._correlated_normals(rng, shape, "precipitation") - 0.5 * sigma**2)
+        precipitation = forcings.precipitation[:, None] * precip_factor
+
+        pet_factor = 1.0 + self.pet_rel_std * self._correlated_normals(rng, shape, "pet")
+        pet = forcings.pet[:, None] * np.maximum(pet_factor, 0.0)
+
+        temperature = forcings.temperature
+        if self.temperature_std > 0.0:
+            temperature = temperature[:, None] + self.temperature_std * self._correlated_normals(rng, shape, "temperature")
+
+        return ForcingTable(precipitation, pet, temperature, forcings.doy, index=forcings.index)
+
+
+def _stress_power(stress: float, exponent: float) -> float:
+    """``stress**exponent``, 常用的整数指数展开为乘法, 避免通用 ``pow`` 调用。"""
+
+    if exponent == 3.0:
+        return stress * stress * stress
+    if exponent == 2.0:
+        return stress * stress
+    if exponent == 1.0:
+        return stress
+    if exponent == 4.0:
+        squared = stress * stress
+        return squared * squared
+    return stress**exponent
+
+
+def _fused_step_kernel(
+    sm: np.ndarray,
+    vwc: np.ndarray,
+    precipitation: np.ndarray,
+    pet: np.ndarray,
+    climate_limiter: np.ndarray,
+    delta_t: float,
+    substeps: np.ndarray,
+    root_zone_depth: np.ndarray,
+    sm_wilt: np.ndarray,
+    sm_field: np.ndarray,
+    sm_sat: np.ndarray,
+    runoff_exponent: np.ndarray,
+    r_max: np.ndarray,
+    vwc_max: np.ndarray,
+    k_sen: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """单次遍历完成水量平衡与植被更新, 成员间并行。
+
+    强迫与参数均为长度 N 的逐成员数组 (标量经 ``np.broadcast_to`` 传入)。成员 i
+    以 ``substeps[i]`` 个等长子步完成一个时间步。运算顺序与 numpy 路径逐项一致;
+    仅幂运算的实现不同, 结果在末位舍入误差内相同。
+    """
+
+    for i in prange(sm.shape[0]):
+        p_i = precipitation[i]
+        pet_i = pet[i]
+        exponent = runoff_exponent[i]
+        dt = delta_t / substeps[i]
+        scale = dt / (root_zone_depth[i] * 1000.0)
+        sm_i = sm[i]
+        vwc_i = vwc[i]
+        for _ in range(substeps[i]):
+            stress = min(max((sm_i - sm_wilt[i]) / (sm_field[i] - sm_wilt[i]), 0.0), 1.0)
+            runoff = min(max(p_i * _stress_power(stress, exponent), 0.0), p_i)
+            et = min(max(stress * pet_i, 0.0), pet_i)
+            sm_next = min(max(sm_i + scale * (p_i - runoff - et), 0.0), sm_sat[i])
+
+            growth = r_max[i] * (climate_limiter[i] * stress) * (1.0 - vwc_i / vwc_max[i])
+            senescence = k_sen[i] * vwc_i
+            vwc_i = min(max(vwc_i + dt * (growth - senescence), 0.0), vwc_max[i])
+            sm_i = sm_next
+        out[i, 0] = sm_i
+        out[i, 1] = vwc_i
+
+
+if numba is not None:
+    _stress_power = numba.njit(inline="always")(_stress_power)
+    _fused_step_kernel = numba.njit(parallel=True, cache=True)(_fused_step_kernel)
 
 
 class ProcessModel:
-    """非线性的水量平衡与植被物候模型。"""
+    """非线性的水量平衡与植被物候模型。
+
+    除 ``delta_t_days`` 外的参数均可为标量或沿像元轴的一维数组 (如由 SoilGrids
+    质地推导的逐像元土壤阈值)。逐像元参数通过 ``pixel_index`` 映射到集合成员:
+    ``(P·N, 2)`` 集合第 i 行属于像元 ``pixel_index[i]``, 例如
+    ``np.repeat(np.arange(P), N)``。未给出 ``pixel_index`` 时, 参数数组直接与成员对齐。
+    """
+
+    # 允许逐像元取值的参数 (属性名)
+    PIXEL_PARAMETERS = (
+        "root_zone_depth",
+        "sm_wilt",
+        "sm_field",
+        "sm_sat",
+        "runoff_exponent",
+        "r_max",
+        "vwc_max",
+        "k_sen",
+        "t_base",
+        "t_opt",
+        "season_peak",
+        "season_width",
+    )
 
     def __init__(
         self,
         *,
         delta_t_days: float = 1.0,
-        root_zone_depth_m: float = 0.3,
-        sm_wilt: float = 0.1,
-        sm_field: float = 0.35,
-        sm_sat: float = 0.45,
-        runoff_exponent: float = 3.0,
-        r_max: float = 0.25,
-        vwc_max: float = 2.5,
-        k_sen: float = 0.015,
-        t_base: float = 5.0,
-        t_opt: float = 30.0,
-        season_peak_doy: float = 200.0,
-        season_width: float = 60.0,
+        root_zone_depth_m: float | np.ndarray = 0.3,
+        sm_wilt: float | np.ndarray = 0.1,
+        sm_field: float | np.ndarray = 0.35,
+        sm_sat: float | np.ndarray = 0.45,
+        runoff_exponent: float | np.ndarray = 3.0,
+        r_max: float | np.ndarray = 0.25,
+        vwc_max: float | np.ndarray = 2.5,
+        k_sen: float | np.ndarray = 0.015,
+        t_base: float | np.ndarray = 5.0,
+        t_opt: float | np.ndarray = 30.0,
+        season_peak_doy: float | np.ndarray = 200.0,
+        season_width: float | np.ndarray = 60.0,
+        pixel_index: Sequence[int] | np.ndarray | None = None,
+        max_substeps: int = 1,
+        substep_precip_mm: float = 20.0,
+        backend: str = "numpy",
     ) -> None:
         # 基础参数: 时间步长、根系层厚度、关键土壤阈值等
         self.delta_t = delta_t_days
-        self.root_zone_depth = root_zone_depth_m
-        self.sm_wilt = sm_wilt
-        self.sm_field = sm_field
-        self.sm_sat = sm_sat
+        self.root_zone_depth = as_parameter(root_zone_depth_m)
+        self.sm_wilt = as_parameter(sm_wilt)
+        self.sm_field = as_parameter(sm_field)
+        self.sm_sat = as_parameter(sm_sat)
 
         # 径流与植被生长控制参数
-        self.runoff_exponent = runoff_exponent
-        self.r_max = r_max
-        self.vwc_max = vwc_max
-        self.k_sen = k_sen
+        self.runoff_exponent = as_parameter(runoff_exponent)
+        self.r_max = as_parameter(r_max)
+        self.vwc_max = as_parameter(vwc_max)
+        self.k_sen = as_parameter(k_sen)
 
         # 温度与季节调节参数
-        self.t_base = t_base
-        self.t_opt = t_opt
-        self.season_peak = season_peak_doy
-        self.season_width = season_width
+        self.t_base = as_parameter(t_base)
+        self.t_opt = as_parameter(t_opt)
+        self.season_peak = as_parameter(season_peak_doy)
+        self.season_width = as_parameter(season_width)
+
+        # 季节限制因子查找表, 季节参数变化时重建
+        self._season_lut: np.ndarray | None = None
+        self._season_table_key: tuple[float, float] | None = None
+
+        # 自适应子步: 单步降水量每超过 substep_precip_mm 增加一个子步, 最多 max_substeps 个;
+        # max_substeps=1 时关闭, 与原显式日步长一致
+        if max_substeps < 1:
+            raise ValueError("max_substeps 必须 >= 1。")
+        self.max_substeps = int(max_substeps)
+        self.substep_precip_mm = substep_precip_mm
+
+        # 集合成员 -> 像元的索引, 供逐像元参数广播使用
+        self.pixel_index = None if pixel_index is None else np.asarray(pixel_index, dtype=np.intp)
+
+        # 计算后端: "numpy" 为参考实现, "numba" 为单遍融合内核, "auto" 在可用时选 numba
+        self.backend = resolve_backend(backend)
 
     # ------------------------------------------------------------------ 辅助函数
-    def _soil_moisture_stress(self, sm: np.ndarray) -> np.ndarray:
+    def member_parameters(self, pixel_index: np.ndarray | None = None) -> dict[str, float | np.ndarray]:
+        """按 ``pixel_index`` 将逐像元参数收集为逐成员数组, 标量参数原样返回。"""
+
+        index = self.pixel_index if pixel_index is None else pixel_index
+        params: dict[str, float | np.ndarray] = {}
+        for name in self.PIXEL_PARAMETERS:
+            value = getattr(self, name)
+            if isinstance(value, np.ndarray) and index is not None:
+                value = value[index]
+            params[name] = value
+        return params
+
+    def _soil_moisture_stress(self, sm: np.ndarray, params: Mapping[str, float | np.ndarray]) -> np.ndarray:
         """土壤湿度归一化函数: 将 SM 映射到 [0,1] 的水分胁迫因子。"""
 
-        stress = (sm - self.sm_wilt) / (self.sm_field - self.sm_wilt)
+        stress = (sm - params["sm_wilt"]) / (params["sm_field"] - params["sm_wilt"])
         return np.clip(stress, 0.0, 1.0)
 
-    def _runoff(self, sm: np.ndarray, precipitation: float) -> np.ndarray:
+    def _runoff(
+        self,
+        sm: np.ndarray,
+        precipitation: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray],
+    ) -> np.ndarray:
         """使用幂律形式计算饱和超渗径流。"""
 
-        saturation = self._soil_moisture_stress(sm)
-        return np.clip(precipitation * saturation**self.runoff_exponent, 0.0, precipitation)
+        saturation = self._soil_moisture_stress(sm, params)
+        return np.clip(precipitation * saturation ** params["runoff_exponent"], 0.0, precipitation)
 
-    def _evapotranspiration(self, sm: np.ndarray, pet: float) -> np.ndarray:
+    def _evapotranspiration(
+        self,
+        sm: np.ndarray,
+        pet: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray],
+    ) -> np.ndarray:
         """将潜在蒸散发乘以水分胁迫系数得到实际蒸散发。"""
 
-        beta = self._soil_moisture_stress(sm)
+        beta = self._soil_moisture_stress(sm, params)
         return np.clip(beta * pet, 0.0, pet)
 
-    def _temperature_limiter(self, temperature: float) -> float:
-        """温度限制因子: 低于基线时生长为零, 高于最佳温度后保持 1。"""
+    def _temperature_limiter(
+        self,
+        temperature: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray] | None = None,
+    ) -> float | np.ndarray:
+        """温度限制因子: 低于基线时生长为零, 高于最佳温度后保持 1。
 
-        if temperature <= self.t_base:
-            return 0.0
-        scale = (temperature - self.t_base) / max(self.t_opt - self.t_base, 1e-6)
-        return float(np.clip(scale, 0.0, 1.0))
+        ``t_opt > t_base`` 时, 低于基线的温度对应负的 scale, 截断后即为 0,
+        因此无需逐元素分支。
+        """
 
-    def _season_limiter(self, doy: float) -> float:
-        """季节限制因子: 以高斯曲线近似光周期/物候效应。"""
+        t_base = self.t_base if params is None else params["t_base"]
+        t_opt = self.t_opt if params is None else params["t_opt"]
+        scale = (np.asarray(temperature, dtype=float) - t_base) / np.maximum(t_opt - t_base, 1e-6)
+        limiter = np.clip(scale, 0.0, 1.0)
+        return float(limiter) if limiter.ndim == 0 else limiter
 
-        relative = (doy - self.season_peak) / self.season_width
-        return float(np.exp(-relative**2))
+    def _season_table(self) -> np.ndarray | None:
+        """按年积日 0-366 预计算的季节限制因子查找表; 逐像元季节参数时返回 None。"""
 
-    # ------------------------------------------------------------------ 核心接口
-    def run(self, state: np.ndarray, forcings: ForcingInputs | Mapping[str, float]) -> np.ndarray:
-        """给定气象强迫, 将状态向量推进一个时间步。"""
+        if isinstance(self.season_peak, np.ndarray) or isinstance(self.season_width, np.ndarray):
+            return None
+        key = (self.season_peak, self.season_width)
+        if self._season_table_key != key:
+            relative = (np.arange(367, dtype=float) - self.season_peak) / self.season_width
+            self._season_lut = np.exp(-relative**2)
+            self._season_table_key = key
+        return self._season_lut
 
-        if isinstance(forcings, Mapping):
-            inputs = ForcingInputs(**forcings)  # type: ignore[arg-type]
-        else:
-            inputs = forcings
+    def _season_limiter(
+        self,
+        doy: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray] | None = None,
+    ) -> float | np.ndarray:
+        """季节限制因子: 以高斯曲线近似光周期/物候效应。
 
-        state = np.asarray(state, dtype=float)
-        was_one_dimensional = state.ndim == 1
-        ensemble = state.reshape(1, -1) if was_one_dimensional else state.copy()
+        整数年积日直接查表, 非整数 (如小时步长) 或逐像元季节参数时按闭式计算。
+        标量年积日 (``EnsembleKalmanFilter.forecast`` 的逐步调用) 不经数组转换。
+        """
+
+        table = self._season_table()
+        if isinstance(doy, (int, float, np.integer, np.floating)) and table is not None:
+            day = float(doy)
+            if day.is_integer() and 0.0 <= day <= 366.0:
+                return float(table[int(day)])
+            return math.exp(-(((day - self.season_peak) / self.season_width) ** 2))
+
+        doy = np.asarray(doy, dtype=float)
+        if table is not None:
+            day = doy.astype(np.intp)
+            if np.all((day == doy) & (day >= 0) & (day <= 366)):
+                limiter = table[day]
+                return float(limiter) if limiter.ndim == 0 else limiter
+
+        season_peak = self.season_peak if params is None else params["season_peak"]
+        season_width = self.season_width if params is None else params["season_width"]
+        relative = (doy - season_peak) / season_width
+        limiter = np.exp(-relative**2)
+        return float(limiter) if limiter.ndim == 0 else limiter
+
+    def climate_limiters(
+        self,
+        temperature: float | np.ndarray,
+        doy: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray] | None = None,
+    ) -> float | np.ndarray:
+        """温度×季节生长限制因子, 对整段强迫序列一次向量化求值。"""
+
+        return self._temperature_limiter(temperature, params) * self._season_limiter(doy, params)
+
+    def _substep_counts(self, precipitation: float | np.ndarray, n_members: int) -> np.ndarray:
+        """按单步降水量为每个成员选择子步数, 干燥日保持 1 步。"""
+
+        if self.max_substeps == 1:
+            return np.ones(n_members, dtype=np.int64)
+        amount = np.broadcast_to(np.asarray(precipitation, dtype=float) * self.delta_t, (n_members,))
+        counts = np.ceil(np.nan_to_num(amount) / self.substep_precip_mm)
+        return np.clip(counts, 1, self.max_substeps).astype(np.int64)
+
+    def _step(
+        self,
+        ensemble: np.ndarray,
+        precipitation: float | np.ndarray,
+        pet: float | np.ndarray,
+        climate_limiter: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray],
+        delta_t: float | np.ndarray,
+    ) -> np.ndarray:
+        """numpy 参考实现: 以步长 ``delta_t`` (标量或逐成员) 显式推进一次。"""
 
         sm = ensemble[:, 0]
         vwc = ensemble[:, 1]
 
-        runoff = self._runoff(sm, inputs.precipitation)
-        et = self._evapotranspiration(sm, inputs.pet)
+        runoff = self._runoff(sm, precipitation, params)
+        et = self._evapotranspiration(sm, pet, params)
 
         # 由水量平衡得到的 SM 变化, 分母 1000 将 mm 转换为 m
         sm_increment = (
-            self.delta_t / (self.root_zone_depth * 1000.0)
-            * (inputs.precipitation - runoff - et)
+            delta_t / (params["root_zone_depth"] * 1000.0)
+            * (precipitation - runoff - et)
         )
-        sm_new = np.clip(sm + sm_increment, 0.0, self.sm_sat)
+        sm_new = np.clip(sm + sm_increment, 0.0, params["sm_sat"])
 
         # 植被生长受温度、季节与土壤水分三重限制, 再乘逻辑斯蒂项避免爆发式增长
-        growth_limiters = (
-            self._temperature_limiter(inputs.temperature)
-            * self._season_limiter(inputs.doy)
-            * self._soil_moisture_stress(sm)
-        )
-        growth = self.r_max * growth_limiters * (1.0 - vwc / self.vwc_max)
-        senescence = self.k_sen * vwc
-        vwc_new = np.clip(vwc + self.delta_t * (growth - senescence), 0.0, self.vwc_max)
+        growth_limiters = climate_limiter * self._soil_moisture_stress(sm, params)
+        growth = params["r_max"] * growth_limiters * (1.0 - vwc / params["vwc_max"])
+        senescence = params["k_sen"] * vwc
+        vwc_new = np.clip(vwc + delta_t * (growth - senescence), 0.0, params["vwc_max"])
+
+        return np.column_stack((sm_new, vwc_new))
+
+    def _advance(
+        self,
+        ensemble: np.ndarray,
+        precipitation: float | np.ndarray,
+        pet: float | np.ndarray,
+        climate_limiter: float | np.ndarray,
+        params: Mapping[str, float | np.ndarray],
+    ) -> np.ndarray:
+        """按给定强迫与温度×季节限制因子推进 ``(N, 2)`` 集合一步。
 
-        updated_state = np.column_stack((sm_new, vwc_new))
+        强迫、限制因子与 ``params`` 中的参数可为标量或可广播到 ``(N,)`` 的逐成员数组。
+        开启自适应子步时, 强降水成员按子步数拆分步长, 其余成员仍只走一步。
+        """
+
+        if self.max_substeps == 1 and self.backend == "numpy":
+            # 未开启子步: 直接走单步参考实现, 不构造逐成员子步数
+            return self._step(ensemble, precipitation, pet, climate_limiter, params, self.delta_t)
+
+        n_members = ensemble.shape[0]
+        substeps = self._substep_counts(precipitation, n_members)
+
+        if self.backend == "numba":
+
+            def member_array(value):
+                return np.broadcast_to(np.asarray(value, dtype=float), (n_members,))
+
+            updated_state = np.empty((n_members, 2))
+            _fused_step_kernel(
+                np.ascontiguousarray(ensemble[:, 0]),
+                np.ascontiguousarray(ensemble[:, 1]),
+                member_array(precipitation),
+                member_array(pet),
+                member_array(climate_limiter),
+                float(self.delta_t),
+                substeps,
+                member_array(params["root_zone_depth"]),
+                member_array(params["sm_wilt"]),
+                member_array(params["sm_field"]),
+                member_array(params["sm_sat"]),
+                member_array(params["runoff_exponent"]),
+                member_array(params["r_max"]),
+                member_array(params["vwc_max"]),
+                member_array(params["k_sen"]),
+                updated_state,
+            )
+            return updated_state
+
+        n_max = int(substeps.max()) if n_members else 1
+        if n_max == 1:
+            return self._step(ensemble, precipitation, pet, climate_limiter, params, self.delta_t)
+
+        # 仅对仍需子步的成员做掩码更新, 同一子步内保持向量化
+        def take(value, mask):
+            return value if np.ndim(value) == 0 else np.broadcast_to(value, (n_members,))[mask]
+
+        delta_t = self.delta_t / substeps
+        current = ensemble.copy()
+        for k in range(n_max):
+            active = substeps > k
+            sub_params = {name: take(value, active) for name, value in params.items()}
+            current[active] = self._step(
+                current[active],
+                take(precipitation, active),
+                take(pet, active),
+                take(climate_limiter, active),
+                sub_params,
+                delta_t[active],
+            )
+        return current
+
+    # ------------------------------------------------------------------ 核心接口
+    def run(
+        self,
+        state: np.ndarray,
+        forcings: ForcingInputs | Mapping[str, float] | Sequence[float] | np.ndarray,
+        pixel_index: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """给定气象强迫, 将状态向量推进一个时间步。
+
+        ``forcings`` 可为 ``ForcingInputs``、字段映射, 或按
+        ``ForcingTable.FIELDS`` 顺序排列的序列 (如 ``ForcingTable.row`` 返回的行视图)。
+        各强迫分量可为标量, 也可为长度 N 的逐成员数组 (如扰动后的降水)。
+        ``pixel_index`` 缺省时使用构造时给出的 ``self.pixel_index``。
+        """
+
+        if isinstance(forcings, Mapping):
+            precipitation = forcings["precipitation"]
+            pet = forcings["pet"]
+            temperature = forcings["temperature"]
+            doy = forcings["doy"]
+        elif isinstance(forcings, ForcingInputs):
+            precipitation, pet = forcings.precipitation, forcings.pet
+            temperature, doy = forcings.temperature, forcings.doy
+        else:
+            precipitation, pet, temperature, doy = forcings
+
+        state = np.asarray(state, dtype=float)
+        was_one_dimensional = state.ndim == 1
+        ensemble = state.reshape(1, -1) if was_one_dimensional else state
+
+        params = self.member_parameters(pixel_index)
+        climate_limiter = self.climate_limiters(temperature, doy, params)
+        updated_state = self._advance(ensemble, precipitation, pet, climate_limiter, params)
         return updated_state[0] if was_one_dimensional else updated_state
+
+    def run_sequence(
+        self,
+        state: np.ndarray,
+        forcings: ForcingTable,
+        start: int = 0,
+        stop: int | None = None,
+        pixel_index: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """连续积分 ``forcings[start:stop]`` 的多个时间步, 返回每步结束时的状态轨迹。
+
+        输入为 ``(2,)`` 时返回 ``(T, 2)``, 输入为 ``(N, 2)`` 时返回 ``(T, N, 2)``。
+        """
+
+        stop = len(forcings) if stop is None else stop
+        state = np.asarray(state, dtype=float)
+        was_one_dimensional = state.ndim == 1
+        ensemble = state.reshape(1, -1) if was_one_dimensional else state
+
+        # 逐像元参数在整段积分中只收集一次
+        params = self.member_parameters(pixel_index)
+        precipitation = forcings.precipitation[start:stop]
+        pet = forcings.pet[start:stop]
+        n_steps = len(precipitation)
+        climate_limiters = self.climate_limiters(
+            forcings.temperature[start:stop].reshape(n_steps, -1),
+            forcings.doy[start:stop].reshape(n_steps, -1),
+            params,
+        )
+
+        trajectory = np.empty((n_steps,) + ensemble.shape)
+        for k in range(n_steps):
+            ensemble = self._advance(ensemble, precipitation[k], pet[k], climate_limiters[k], params)
+            trajectory[k] = ensemble
+        return trajectory[:, 0] if was_one_dimensional else trajectory
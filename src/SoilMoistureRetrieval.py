@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""由 GNSS-R 反射率直接反演土壤湿度 (观测算子的逆)。
+
+固定 VWC 与地表粗糙度时, 粗糙度与植被衰减因子可解析地从反射率中除去, 问题化为
+求解 ``gamma_smooth(SM; θ, T) = Γ / (粗糙度因子 · 植被因子)``。在 Mironov 混合项的
+``q`` 坐标 (见 ``ReflectivityLookupTable``) 上 ``gamma_smooth`` 单调递增, 因此先用
+由正向查找表逆插值得到的初值, 再做几步带解析导数的向量化牛顿迭代。全程无逐点
+Python 循环, 可用于百万量级镜面点的基线产品或 ``initialize()`` 的初值。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from ObservationModel import ObservationModel, ReflectivityLookupTable
+
+
+class SoilMoistureRetrieval:
+    """固定 VWC 下的反射率 → SM 向量化反演。"""
+
+    def __init__(
+        self,
+        model: ObservationModel,
+        *,
+        n_gamma: int = 256,
+        n_newton: int = 3,
+        **lut_kwargs,
+    ) -> None:
+        if model._texture_constants()["pixel_class"] is not None:
+            raise ValueError("SM 反演仅支持均一质地的观测模型")
+
+        # 正向查找表: 若模型已启用则直接复用, 否则按 lut_kwargs 构建 (不改变模型本身)
+        self.model = model
+        self.lut = model.lut if model.lut is not None and not lut_kwargs else ReflectivityLookupTable(model, **lut_kwargs)
+        self.n_newton = n_newton
+
+        # q 坐标的取值范围与束缚水分界点
+        g = 0.65
+        self.q_min = float(self.lut.q_grid[0])
+        self.q_max = float(self.lut.sm_coordinate(np.array([model.porosity - 1e-6]))[0])
+        self.q_kink = min(self.lut.theta_bound_max / self.lut.phi, 1.0) ** g
+
+        # 逆表: 每个 (θ, T) 列上 gamma_smooth 沿 q 单调, 以归一化反射率为自变量反插值 q
+        self.gamma_min = self.lut.table[0]
+        self.gamma_max = self.lut.table[-1]
+        self.inverse_table = self._build_inverse(n_gamma)
+
+    def _build_inverse(self, n_gamma: int) -> np.ndarray:
+        """返回 ``(n_gamma, n_incidence, n_temperature)`` 的 q 表。"""
+
+        table = np.maximum.accumulate(self.lut.table, axis=0)
+        span = np.maximum(self.gamma_max - self.gamma_min, 1e-12)
+        levels = np.linspace(0.0, 1.0, n_gamma)
+        inverse = np.empty((n_gamma,) + table.shape[1:])
+        for j in range(table.shape[1]):
+            for k in range(table.shape[2]):
+                normalized = (table[:, j, k] - self.gamma_min[j, k]) / span[j, k]
+                inverse[:, j, k] = np.interp(levels, normalized, self.lut.q_grid)
+        return inverse
+
+    # ------------------------------------------------------------------ 辅助函数
+    def _initial_guess(self, gamma: np.ndarray, incidence: np.ndarray, temperature: np.ndarray) -> np.ndarray:
+        """在 (θ, T) 四个相邻列上分别逆插值 q, 再双线性加权。"""
+
+        j, wj = self.lut._locate(self.lut.incidence_grid, incidence)
+        k, wk = self.lut._locate(self.lut.temperature_grid, temperature)
+        n_gamma = self.inverse_table.shape[0]
+
+        q = np.zeros(np.shape(gamma))
+        for dj, weight_j in ((0, 1.0 - wj), (1, wj)):
+            for dk, weight_k in ((0, 1.0 - wk), (1, wk)):
+                g_min = self.gamma_min[j + dj, k + dk]
+                span = np.maximum(self.gamma_max[j + dj, k + dk] - g_min, 1e-12)
+                position = np.clip((gamma - g_min) / span, 0.0, 1.0) * (n_gamma - 1)
+                index = np.minimum(position.astype(np.intp), n_gamma - 2)
+                w = position - index
+                column = self.inverse_table[index, j + dj, k + dk] * (1.0 - w)
+                column += self.inverse_table[index + 1, j + dj, k + dk] * w
+                q += weight_j * weight_k * column
+        return q
+
+    def _gamma_and_slope(
+        self,
+        q: np.ndarray,
+        sqrt_eps_free: np.ndarray,
+        cos_theta: np.ndarray,
+        sin_theta_sq: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """q 坐标下的 ``gamma_smooth`` 及其对 q 的解析导数。
+
+        混合项对 q 分段线性, ε = mix², Fresnel 项对 ε 全纯, 故
+        ``dγ/dq = Re(conj(r_vv - r_hh) · d(r_vv - r_hh)/dε) · 2·mix·dmix/dq``。
+        """
+
+        constants = self.model._texture_constants()
+        below = q <= self.q_kink
+        slope_mix = np.where(below, constants["sqrt_eps_bound"] - 1.0, sqrt_eps_free - 1.0)
+        mix = (
+            1.0
+            + constants["mix_solid"]
+            + np.minimum(q, self.q_kink) * (constants["sqrt_eps_bound"] - 1.0)
+            + np.maximum(q - self.q_kink, 0.0) * (sqrt_eps_free - 1.0)
+        )
+        epsilon = mix * mix
+
+        sqrt_term = np.sqrt(epsilon - sin_theta_sq)
+        d_sqrt = 0.5 / sqrt_term
+        r_hh = (cos_theta - sqrt_term) / (cos_theta + sqrt_term)
+        r_vv = (epsilon * cos_theta - sqrt_term) / (epsilon * cos_theta + sqrt_term)
+        d_hh = -2.0 * cos_theta * d_sqrt / (cos_theta + sqrt_term) ** 2
+        d_vv = 2.0 * cos_theta * (sqrt_term - epsilon * d_sqrt) / (epsilon * cos_theta + sqrt_term) ** 2
+
+        difference = r_vv - r_hh
+        gamma = 0.5 * np.abs(difference) ** 2
+        slope = np.real(np.conj(difference) * (d_vv - d_hh) * 2.0 * mix * slope_mix)
+        return gamma, slope
+
+    # ------------------------------------------------------------------ 核心接口
+    def retrieve(
+        self,
+        reflectivity: np.ndarray | float,
+        *,
+        vwc: np.ndarray | float,
+        incidence_angle_deg: np.ndarray | float | None = None,
+        temperature_kelvin: np.ndarray | float = 295.0,
+        surface_rms_height_m: np.ndarray | float | None = None,
+        vegetation_b: np.ndarray | float | None = None,
+    ) -> np.ndarray:
+        """逐点反演 SM, 所有输入按 numpy 规则广播。
+
+        几何与地表参数缺省时使用模型默认值。超出 ``[SM_min, 孔隙度]`` 可达范围的
+        反射率截断到边界; 非有限或非正的反射率返回 NaN。
+        """
+
+        model = self.model
+        if incidence_angle_deg is None:
+            incidence_angle_deg = model.default_incidence_angle
+        if surface_rms_height_m is None:
+            surface_rms_height_m = model.default_surface_rms_height
+        if vegetation_b is None:
+            vegetation_b = model.default_vegetation_b
+
+        refl, vwc, incidence, temperature, rms_height, b = np.broadcast_arrays(
+            *(
+                np.asarray(value, dtype=float)
+                for value in (reflectivity, vwc, incidence_angle_deg, temperature_kelvin, surface_rms_height_m, vegetation_b)
+            )
+        )
+
+        # 解析地除去粗糙度与植被衰减
+        theta_rad = np.deg2rad(incidence)
+        cos_theta = np.cos(theta_rad)
+        k = 2.0 * np.pi * model.frequency_hz / 299792458.0
+        roughness_factor = np.exp(-((2.0 * k * rms_height) ** 2) * cos_theta**2)
+        vegetation_factor = np.exp(-2.0 * b * vwc / cos_theta)
+        gamma = refl / (roughness_factor * vegetation_factor)
+
+        q = self._initial_guess(gamma, incidence, temperature)
+        sqrt_eps_free = model._sqrt_eps_free(temperature)
+        sin_theta_sq = np.sin(theta_rad) ** 2
+        for _ in range(self.n_newton):
+            value, slope = self._gamma_and_slope(q, sqrt_eps_free, cos_theta, sin_theta_sq)
+            step = np.where(slope > 0.0, (value - gamma) / np.where(slope > 0.0, slope, 1.0), 0.0)
+            q = np.clip(q - step, self.q_min, self.q_max)
+
+        sm = self.lut._sm_from_coordinate(q)
+        return np.where(np.isfinite(refl) & (refl > 0.0), sm, np.nan)
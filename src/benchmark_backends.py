@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""numpy 与 numba 计算后端的单步耗时对比 (需要安装 numba)。
+
+用法: ``python src/benchmark_backends.py [成员数] [重复次数]``, 默认 128000 个成员。
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from ObservationModel import ObservationModel
+from ProcessModel import ProcessModel
+
+
+def time_call(function, repeats: int) -> float:
+    """预热一次后取 ``repeats`` 次调用的平均耗时 (ms)。"""
+
+    function()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def benchmark_process_model(n_members: int, repeats: int) -> None:
+    """日步长预测: 逐成员扰动降水, 标量 PET/气温/年积日。"""
+
+    rng = np.random.default_rng(0)
+    ensemble = np.column_stack([rng.uniform(0.05, 0.45, n_members), rng.uniform(0.0, 2.5, n_members)])
+    forcings = (rng.uniform(0.0, 30.0, n_members), 4.0, 22.0, 180)
+
+    results = {}
+    for backend in ("numpy", "numba"):
+        model = ProcessModel(backend=backend)
+        elapsed = time_call(lambda: model.run(ensemble, forcings), repeats)
+        results[backend] = model.run(ensemble, forcings)
+        print(f"ProcessModel.run     {backend:>5s}: {elapsed:8.3f} ms/step")
+    print(f"  max |numba - numpy| = {np.max(np.abs(results['numba'] - results['numpy'])):.2e}")
+
+
+def benchmark_observation_model(n_members: int, repeats: int) -> None:
+    """精确观测算子: 标量观测几何, 集合跨越束缚水/自由水分界点。"""
+
+    rng = np.random.default_rng(0)
+    ensemble = np.column_stack([rng.uniform(0.02, 0.5, n_members), rng.uniform(0.0, 2.5, n_members)])
+
+    results = {}
+    for backend in ("numpy", "numba"):
+        model = ObservationModel(sand_fraction=0.3, clay_fraction=0.25, backend=backend)
+        elapsed = time_call(lambda: model.run(ensemble), repeats)
+        results[backend] = model.run(ensemble)
+        print(f"ObservationModel.run {backend:>5s}: {elapsed:8.3f} ms/step")
+    print(f"  max |numba - numpy| = {np.max(np.abs(results['numba'] - results['numpy'])):.2e}")
+
+
+def main() -> None:
+    n_members = int(sys.argv[1]) if len(sys.argv) > 1 else 128_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"N = {n_members}, repeats = {repeats}")
+    benchmark_process_model(n_members, repeats)
+    benchmark_observation_model(n_members, repeats)
+
+
+if __name__ == "__main__":
+    main()
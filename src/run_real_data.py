@@ -16,15 +16,16 @@ from __future__ import annotations
 import datetime as dt
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
 
 import numpy as np
 import earthaccess
 import pandas as pd
 import xarray as xr
 
-from ProcessModel import ForcingInputs, ProcessModel
+from ProcessModel import ForcingPerturbation, ForcingTable, ProcessModel
 from ObservationModel import ObservationModel, ObservationParams
+from ObservationErrorModel import ObservationErrorModel
 from EnsembleKalmanFilter import EnsembleKalmanFilter
 
 
@@ -137,6 +138,77 @@ def load_era5_land(paths: Sequence[Path], region: Region, start: pd.Timestamp, e
     return df
 
 
+def _naive_utc(ts: pd.Timestamp) -> pd.Timestamp:
+    """NetCDF 时间坐标为无时区 UTC, 比较前去掉时区信息。"""
+
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _area_mean(da: xr.DataArray) -> np.ndarray:
+    """对除 time 外的维度求区域平均, 仅在此处触发实际读取。"""
+
+    return np.asarray(da.mean(dim=[d for d in da.dims if d != "time"]).values, dtype=float)
+
+
+def iter_hourly_forcings(
+    imerge_paths: Sequence[Path],
+    era5_paths: Sequence[Path],
+    region: Region,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    window_hours: int = 24,
+    era5_accumulated: bool = True,
+) -> Iterator[ForcingTable]:
+    """按时间窗口流式生成小时强迫, 供 ``ProcessModel(delta_t_days=1/24)`` 使用。
+
+    数据集以惰性方式打开, 每个窗口只读取 ``window_hours`` 小时的 IMERG 半小时与
+    ERA5-Land 小时切片并做区域平均, 内存占用与窗口长度而非整段时间成正比。
+
+    输出的降水与 PET 为强度 (mm/day), 与过程模型中 ``delta_t`` 的换算保持一致;
+    doy 为带小时小数的年积日。``era5_accumulated`` 表示 ERA5-Land 的 pev 为自 00 UTC
+    起的累积量 (CDS 小时产品的约定), 需差分为逐小时量。
+    """
+
+    precip_ds = _subset_bbox(xr.open_mfdataset(imerge_paths, combine="by_coords"), region)
+    era5_ds = _subset_bbox(xr.open_mfdataset(era5_paths, combine="by_coords"), region)
+    precip_var = "precipitationCal" if "precipitationCal" in precip_ds.data_vars else "precipitation"
+    if precip_var not in precip_ds.data_vars:
+        precip_var = list(precip_ds.data_vars)[0]
+    t2m_name = "t2m" if "t2m" in era5_ds.data_vars else "T2M"
+
+    hours = pd.date_range(_naive_utc(start).floor("h"), _naive_utc(end), freq="1h")
+    one_hour = pd.Timedelta(hours=1)
+
+    for offset in range(0, len(hours), window_hours):
+        window = hours[offset:offset + window_hours]
+        labels = window.append(pd.DatetimeIndex([window[-1] + one_hour]))
+
+        # IMERG 半小时降水率 (mm/hr): 落在 [h, h+1) 内的切片取平均
+        precip_slab = precip_ds[precip_var].sel(time=slice(window[0], labels[-1] - pd.Timedelta(seconds=1)))
+        precip_series = pd.Series(_area_mean(precip_slab), index=pd.DatetimeIndex(precip_slab["time"].values))
+        precip_hourly = precip_series.resample("1h").mean().reindex(window).fillna(0.0).to_numpy()
+
+        # ERA5-Land: 多读一个时次, 以便差分累积量并对气温取时段平均;
+        # 末窗口越过数据末端时以最近时次补齐
+        era5_slab = era5_ds[[t2m_name, "pev"]].sel(time=labels, method="nearest")
+        t2m = _area_mean(era5_slab[t2m_name]) - 273.15
+        pev = _area_mean(era5_slab["pev"])
+        if era5_accumulated:
+            # 标签 t 的累积量覆盖 (00 UTC, t]; 01 UTC 为当日首小时, 其余与前一时次差分
+            pev_hourly = np.where(labels[1:].hour == 1, pev[1:], pev[1:] - pev[:-1])
+        else:
+            pev_hourly = pev[1:]
+
+        yield ForcingTable(
+            precipitation=precip_hourly * 24.0,
+            pet=-pev_hourly * 1000.0 * 24.0,  # era5 中的潜在蒸发为负值, 单位 m
+            temperature=0.5 * (t2m[:-1] + t2m[1:]),
+            doy=window.dayofyear + window.hour / 24.0,
+            index=window.tz_localize("UTC"),
+        )
+
+
 def load_cygnss_reflectivity(paths: Sequence[Path], region: Region, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
     """读取 CYGNSS Level 1/2 反射率, 输出日平均观测。"""
 
@@ -166,8 +238,19 @@ def load_cygnss_reflectivity(paths: Sequence[Path], region: Region, start: pd.Ti
     return df
 
 
-def load_soil_texture(path: Path, region: Region) -> Mapping[str, float]:
-    """读取土壤质地 (沙/粘) 平均值, 供观测/过程模型参数使用。"""
+def load_soil_texture(
+    path: Path,
+    region: Region,
+    aggregate: bool = True,
+) -> Mapping[str, float] | tuple[Mapping[str, np.ndarray], Mapping[str, np.ndarray]]:
+    """读取土壤质地 (沙/粘), 供观测/过程模型参数使用。
+
+    ``aggregate=True`` 时返回研究区平均值。否则返回 ``(texture, pixels)``: ``texture``
+    为展平的逐像元数组 (剔除缺测像元), 可直接传给 ``ObservationModel`` 并配合
+    ``pixel_index`` 使用; ``pixels`` 给出保留像元的 ``lat``/``lon`` 以及网格上的
+    有效像元掩码 ``valid_mask``, 第 p 个像元即 ``valid_mask`` 中按行展开的第 p 个
+    True, 用于与观测或其他逐像元数组对齐。
+    """
 
     ds = xr.open_dataset(path)
     ds = _subset_bbox(ds, region)
@@ -175,9 +258,25 @@ def load_soil_texture(path: Path, region: Region) -> Mapping[str, float]:
     sand_var = "sand" if "sand" in ds.data_vars else "sand_fraction"
     clay_var = "clay" if "clay" in ds.data_vars else "clay_fraction"
 
-    sand = float(ds[sand_var].mean().values)
-    clay = float(ds[clay_var].mean().values)
-    return {"sand_fraction": sand, "clay_fraction": clay}
+    if aggregate:
+        sand = float(ds[sand_var].mean().values)
+        clay = float(ds[clay_var].mean().values)
+        return {"sand_fraction": sand, "clay_fraction": clay}
+
+    sand_grid = ds[sand_var]
+    sand_map = np.asarray(sand_grid.values, dtype=float)
+    clay_map = np.asarray(ds[clay_var].transpose(*sand_grid.dims).values, dtype=float)
+    valid = np.isfinite(sand_map) & np.isfinite(clay_map)
+
+    # 经纬度按质地变量的维度顺序广播到网格, 与展平顺序一致
+    lat_name = _guess_coord_name(ds, ["lat", "latitude", "Latitude"])
+    lon_name = _guess_coord_name(ds, ["lon", "longitude", "Longitude"])
+    lat_grid = np.asarray(ds[lat_name].broadcast_like(sand_grid).transpose(*sand_grid.dims).values, dtype=float)
+    lon_grid = np.asarray(ds[lon_name].broadcast_like(sand_grid).transpose(*sand_grid.dims).values, dtype=float)
+
+    texture = {"sand_fraction": sand_map[valid], "clay_fraction": clay_map[valid]}
+    pixels = {"lat": lat_grid[valid], "lon": lon_grid[valid], "valid_mask": valid}
+    return texture, pixels
 
 
 # ---------------------------------------------------------------------------
@@ -270,47 +369,79 @@ def prepare_observations(obs_df: pd.DataFrame) -> pd.DataFrame:
 # ---------------------------------------------------------------------------
 
 def run_assimilation(
-    forcings: pd.DataFrame,
+    forcings: pd.DataFrame | Iterable[ForcingTable],
     observations: pd.DataFrame,
     soil_params: Mapping[str, float],
     observation_std: float = 0.02,
+    error_model: ObservationErrorModel | None = None,
+    forcing_perturbation: ForcingPerturbation | None = None,
+    q_std: Sequence[float] = (0.015, 0.15),
+    delta_t_days: float = 1.0,
 ) -> pd.DataFrame:
-    """使用真实数据执行 EnKF, 返回结果时间序列。"""
+    """使用真实数据执行 EnKF, 返回结果时间序列。
+
+    提供 ``error_model`` 时, R 按观测逐日由反射率、点数、入射角等构造;
+    否则使用常数 ``observation_std``。提供 ``forcing_perturbation`` 时, 各成员使用
+    预先抽取的扰动强迫, 此时可相应减小加性过程噪声 ``q_std``。
+
+    ``forcings`` 可为逐日 DataFrame, 也可为 ``iter_hourly_forcings`` 之类的
+    ``ForcingTable`` 流 (配合 ``delta_t_days=1/24``); ``q_std`` 按日给出, 每步方差
+    乘以 ``delta_t_days``。逐日观测在推进到当日结束的那一步之后同化, 日步长与小时
+    步长下均为整日预报之后。扰动强迫的 AR(1) 状态在流式窗口之间延续。
+    """
 
-    process_model = ProcessModel()
+    process_model = ProcessModel(delta_t_days=delta_t_days)
     observation_model = ObservationModel(**soil_params)
     enkf = EnsembleKalmanFilter(process_model, observation_model, ensemble_size=80)
 
     enkf.initialize(initial_mean=[0.25, 1.2], initial_cov=np.diag([0.02**2, 0.4**2]))
-    q = np.diag([0.015**2, 0.15**2])
+    q = np.diag(np.square(q_std)) * delta_t_days
     r = np.array([[observation_std**2]])
 
+    if isinstance(forcings, pd.DataFrame):
+        forcing_tables: Iterable[ForcingTable] = [ForcingTable.from_frame(forcings.sort_index())]
+    else:
+        forcing_tables = forcings
+    rng = np.random.default_rng()
+    if forcing_perturbation is not None:
+        forcing_perturbation.reset()
+    step = pd.Timedelta(days=delta_t_days)
+
     results = []
-    for time, forcing_row in forcings.sort_index().iterrows():
-        forcing = ForcingInputs(
-            precipitation=float(forcing_row["precipitation"]),
-            pet=float(forcing_row["pet"]),
-            temperature=float(forcing_row["temperature"]),
-            doy=float(forcing_row["doy"]),
-        )
-        enkf.forecast(forcing.__dict__, q)
-
-        if time in observations.index:
-            obs_row = observations.loc[time]
-            params = ObservationParams(
-                incidence_angle_deg=float(obs_row["incidence_angle"]),
-                surface_rms_height_m=0.015,
-                vegetation_b=0.12,
-                temperature_kelvin=298.0,
-            )
-            observation_value = float(obs_row["reflectivity"])
-            enkf.analysis(observation_value, r, params.__dict__)
-
-        results.append({
-            "time": time,
-            "sm_forecast": enkf.state_estimate[0],
-            "vwc_forecast": enkf.state_estimate[1],
-        })
+    for forcing_table in forcing_tables:
+        if forcing_perturbation is not None:
+            forcing_table = forcing_perturbation.draw(forcing_table, enkf.N, rng)
+        for k, time in enumerate(forcing_table.index):
+            enkf.forecast(forcing_table.row(k), q)
+
+            # 本步结束时跨入下一日, 即当日预报完成, 同化当日观测
+            day = time.floor("D")
+            if (time + step).floor("D") != day and day in observations.index:
+                obs_row = observations.loc[day]
+                params = ObservationParams(
+                    incidence_angle_deg=float(obs_row["incidence_angle"]),
+                    surface_rms_height_m=0.015,
+                    vegetation_b=0.12,
+                    temperature_kelvin=298.0,
+                )
+                observation_value = float(obs_row["reflectivity"])
+                if error_model is not None:
+                    obs_r = error_model.variances(
+                        observation_value,
+                        n_points=obs_row.get("n_points"),
+                        incidence_angle_deg=float(obs_row["incidence_angle"]),
+                        quality_flags_2=obs_row.get("quality_flags_2"),
+                        ddm_ant=obs_row.get("ddm_ant"),
+                    )
+                else:
+                    obs_r = r
+                enkf.analysis(observation_value, obs_r, params.__dict__)
+
+            results.append({
+                "time": time,
+                "sm_forecast": enkf.state_estimate[0],
+                "vwc_forecast": enkf.state_estimate[1],
+            })
 
     return pd.DataFrame(results).set_index("time")
 
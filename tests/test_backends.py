@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""numba 融合内核与 numpy 参考实现的一致性检验。"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+pytest.importorskip("numba")
+
+from ObservationModel import ObservationModel, ObservationParams  # noqa: E402
+from ProcessModel import ProcessModel  # noqa: E402
+
+
+def _ensemble(n_members: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(0.0, 0.5, n_members), rng.uniform(0.0, 2.5, n_members)])
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        None,
+        ObservationParams(
+            incidence_angle_deg=25.0,
+            surface_rms_height_m=0.02,
+            vegetation_b=0.1,
+            temperature_kelvin=280.0,
+        ),
+    ],
+)
+def test_observation_model_backends_agree(params):
+    ensemble = _ensemble(2000)
+    kwargs = dict(sand_fraction=0.3, clay_fraction=0.25)
+
+    expected = ObservationModel(backend="numpy", **kwargs).run(ensemble, params)
+    actual = ObservationModel(backend="numba", **kwargs).run(ensemble, params)
+    assert np.allclose(actual, expected, rtol=1e-12, atol=1e-14)
+
+
+def test_observation_model_backends_agree_per_pixel_texture():
+    n_pixels, n_members = 4, 50
+    ensemble = _ensemble(n_pixels * n_members, seed=1)
+    kwargs = dict(
+        sand_fraction=np.array([0.2, 0.4, 0.6, 0.3]),
+        clay_fraction=np.array([0.4, 0.2, 0.05, 0.4]),
+        bulk_density=np.array([1.2, 1.4, 1.5, 1.2]),
+        pixel_index=np.repeat(np.arange(n_pixels), n_members),
+    )
+
+    expected = ObservationModel(backend="numpy", **kwargs).run(ensemble)
+    actual = ObservationModel(backend="numba", **kwargs).run(ensemble)
+    assert np.allclose(actual, expected, rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"runoff_exponent": 2.5},
+        {"max_substeps": 4, "substep_precip_mm": 10.0},
+        {"runoff_exponent": np.array([1.0, 2.0, 3.0, 4.0, 2.5]), "pixel_index": np.repeat(np.arange(5), 40)},
+    ],
+)
+def test_process_model_backends_agree(kwargs):
+    ensemble = _ensemble(200, seed=2)
+    precipitation = np.random.default_rng(3).uniform(0.0, 60.0, ensemble.shape[0])
+    forcings = (precipitation, 4.0, 22.0, 180)
+
+    expected = ProcessModel(backend="numpy", **kwargs).run(ensemble, forcings)
+    actual = ProcessModel(backend="numba", **kwargs).run(ensemble, forcings)
+    assert np.allclose(actual, expected, rtol=1e-12, atol=1e-14)